@@ -46,7 +46,7 @@ tornado_pyvows are pyvows extensions to tornado web framework.
                    'Programming Language :: Python :: 2.6',
                    'Topic :: Software Development :: Testing'
     ],
-    packages = ['tornado_pyvows'],
+    packages = ['tornado_pyvows', 'tornado_pyvows.benchmarks'],
     package_dir = {"tornado_pyvows": "tornado_pyvows"},
 
     tests_require = tests_require,
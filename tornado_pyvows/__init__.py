@@ -10,8 +10,11 @@
 
 # flake8: noqa
 
+from . import assertions
 from .context import (
     TornadoContext,
     TornadoHTTPContext,
     IsolatedTornadoHTTPContext
 )
+from .load import LoadTestTornadoHTTPContext
+from .websocket import TornadoWebSocketContext
@@ -0,0 +1,130 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+"""
+Assertions on the responses returned by ``fetch``, registered on import::
+
+    expect(topic).to_have_status(201)
+    expect(topic).to_have_header('Content-Type', re.compile('^text/'))
+    expect(topic).to_have_json_path('items[0].name', 'tornado')
+    expect(topic).Not.to_have_json_path('error')
+
+They read the cached views of ``tornado_pyvows.response.Response``, so the
+body is parsed once whatever the number of vows checking it.
+"""
+
+from pyvows import Vows
+
+from tornado_pyvows.response import Response
+
+_missing = object()
+
+
+def _matches(value, expected):
+    if hasattr(expected, 'search'):
+        return value is not None and expected.search(value) is not None
+    return value == expected
+
+
+def _describe(expected):
+    return getattr(expected, 'pattern', expected)
+
+
+def _header(topic, name):
+    # several headers of the same name are checked as the one value Tornado
+    # folds them into
+    return Response.wrap(topic).headers.get(name)
+
+
+def _json_path(topic, path):
+    return Response.wrap(topic).json_path(path, _missing)
+
+
+@Vows.assertion
+def to_have_status(topic, code):
+    if topic.code != code:
+        raise AssertionError(
+            'Expected response to have status %d, but it has %d' %
+            (code, topic.code)
+        )
+
+
+@Vows.assertion
+def not_to_have_status(topic, code):
+    if topic.code == code:
+        raise AssertionError(
+            'Expected response not to have status %d' % code
+        )
+
+
+@Vows.assertion
+def to_have_header(topic, name, expected=_missing):
+    """``expected`` is a string or a compiled regular expression; without
+    it the header only has to be there."""
+    value = _header(topic, name)
+    if value is None:
+        raise AssertionError(
+            'Expected response to have a %s header' % name
+        )
+    if expected is not _missing and not _matches(value, expected):
+        raise AssertionError(
+            'Expected the %s header of the response to match %r, but it '
+            'is %r' % (name, _describe(expected), value)
+        )
+
+
+@Vows.assertion
+def not_to_have_header(topic, name, expected=_missing):
+    value = _header(topic, name)
+    if value is None:
+        return
+    if expected is _missing:
+        raise AssertionError(
+            'Expected response not to have a %s header, but it is %r' %
+            (name, value)
+        )
+    if _matches(value, expected):
+        raise AssertionError(
+            'Expected the %s header of the response not to match %r' %
+            (name, _describe(expected))
+        )
+
+
+@Vows.assertion
+def to_have_json_path(topic, path, expected=_missing):
+    """Checks there is a value at ``path`` in the JSON body (see
+    ``Response.json_path``) and, if given, that it is ``expected``."""
+    value = _json_path(topic, path)
+    if value is _missing:
+        raise AssertionError(
+            'Expected the JSON body of the response to have %s' % path
+        )
+    if expected is not _missing and value != expected:
+        raise AssertionError(
+            'Expected %s in the JSON body of the response to be %r, but it '
+            'is %r' % (path, expected, value)
+        )
+
+
+@Vows.assertion
+def not_to_have_json_path(topic, path, expected=_missing):
+    value = _json_path(topic, path)
+    if value is _missing:
+        return
+    if expected is _missing:
+        raise AssertionError(
+            'Expected the JSON body of the response not to have %s, but it '
+            'is %r' % (path, value)
+        )
+    if value == expected:
+        raise AssertionError(
+            'Expected %s in the JSON body of the response not to be %r' %
+            (path, expected)
+        )
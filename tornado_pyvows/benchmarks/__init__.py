@@ -0,0 +1,116 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+"""
+Measures the overhead tornado_pyvows adds to plain Tornado and writes the
+results as JSON, to compare them from release to release::
+
+    $ env PYTHONPATH=. python -m tornado_pyvows.benchmarks -o benchmarks.json
+
+The report has a fixed layout (``FORMAT`` is bumped whenever it changes)::
+
+    {"format": 1,
+     "environment": {"python": "2.7.18", "tornado": "2.4.1",
+                     "tornado_pyvows": "0.6.1"},
+     "results": [{"benchmark": "fetch_latency",
+                  "metric": "server_fetch_mean",
+                  "unit": "us/request",
+                  "value": 412.5,
+                  "iterations": 500}, ...]}
+
+Results are sorted by benchmark and metric.
+"""
+
+import json
+import optparse
+import platform
+import sys
+
+import tornado
+
+from tornado_pyvows.version import __version__
+
+FORMAT = 1
+
+#: Modules of this package, each with a ``run(iterations)`` returning
+#: ``(metric, unit, value)`` tuples and its default ``ITERATIONS``.
+BENCHMARKS = (
+    'attribute_lookup',
+    'context_setup',
+    'fetch_latency',
+    'import_time',
+    'isolated_context',
+    'multipart_encoding',
+)
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'tornado': tornado.version,
+        'tornado_pyvows': '.'.join(str(part) for part in __version__),
+    }
+
+
+def run(names=BENCHMARKS, scale=1.0, file=None):
+    """Runs the ``names`` benchmarks with their default iterations times
+    ``scale``, returning the report."""
+    results = []
+    for name in names:
+        module_name = 'tornado_pyvows.benchmarks.' + name
+        __import__(module_name)
+        module = sys.modules[module_name]
+        iterations = max(1, int(module.ITERATIONS * scale))
+        if file is not None:
+            file.write('%s (%d iterations)\n' % (name, iterations))
+        for metric, unit, value in module.run(iterations):
+            results.append({
+                'benchmark': name,
+                'metric': metric,
+                'unit': unit,
+                'value': round(value, 3),
+                'iterations': iterations,
+            })
+            if file is not None:
+                file.write('  %-28s %12.3f %s\n' % (metric, value, unit))
+    results.sort(key=lambda result: (result['benchmark'], result['metric']))
+    return {'format': FORMAT, 'environment': environment(),
+            'results': results}
+
+
+def write_report(report, filename):
+    with open(filename, 'w') as report_file:
+        json.dump(report, report_file, indent=2, sort_keys=True,
+                  separators=(',', ': '))
+        report_file.write('\n')
+
+
+def main(args=None):
+    parser = optparse.OptionParser(
+        usage='%prog [options] [benchmark ...]',
+        description='Measures the overhead of tornado_pyvows. The benchmarks '
+                    'are any of %s (default: all).' % ', '.join(BENCHMARKS)
+    )
+    parser.add_option('-o', '--output', default=None,
+                      help='file to write the JSON report to')
+    parser.add_option('-s', '--scale', type='float', default=1.0,
+                      help='multiplies the iterations of every benchmark')
+    options, names = parser.parse_args(args)
+    for name in names:
+        if name not in BENCHMARKS:
+            parser.error('unknown benchmark: %s' % name)
+
+    report = run(names or BENCHMARKS, options.scale, sys.stderr)
+    if options.output:
+        write_report(report, options.output)
+    else:
+        json.dump(report, sys.stdout, indent=2, sort_keys=True,
+                  separators=(',', ': '))
+        sys.stdout.write('\n')
@@ -0,0 +1,13 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+from tornado_pyvows.benchmarks import main
+
+main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+"""
+How long it takes a context to resolve an attribute set on the outermost
+context, at several nesting depths, with the parent lookup cache warm and
+right after the attribute was set again.
+"""
+
+import time
+
+from tornado_pyvows import TornadoContext
+
+ITERATIONS = 10000
+DEPTHS = (1, 5, 10, 20)
+
+
+class Context(TornadoContext):
+    pass
+
+
+def nested(depth):
+    root = context = Context(None)
+    root.io_loop = object()
+    for _ in range(depth):
+        context = Context(context)
+    return root, context
+
+
+def lookup_cost(depth, lookups, invalidate):
+    root, leaf = nested(depth)
+    io_loop = root.io_loop
+    start = time.time()
+    for _ in range(lookups):
+        if invalidate:
+            root.io_loop = io_loop
+        leaf.io_loop
+    return (time.time() - start) / lookups
+
+
+def run(iterations=ITERATIONS):
+    results = []
+    for depth in DEPTHS:
+        results.append(('depth_%02d_cached' % depth, 'us/lookup',
+                        lookup_cost(depth, iterations, False) * 1e6))
+        results.append(('depth_%02d_invalidated' % depth, 'us/lookup',
+                        lookup_cost(depth, iterations, True) * 1e6))
+    return results
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+"""
+``setup``/``teardown`` cost of a ``TornadoHTTPContext`` defining ``get_app``
+(one ``HTTPServer`` each), of a child context sharing the server of its
+parent (``reuse_http_server``) and of one skipping it
+(``in_process_transport``), against building and stopping an application
+and server with Tornado alone.
+"""
+
+import time
+
+import tornado.web
+from tornado.httpserver import HTTPServer
+from tornado.ioloop import IOLoop
+
+from tornado_pyvows import TornadoHTTPContext
+from tornado_pyvows.ports import bind_unused_port
+
+ITERATIONS = 200
+
+
+class HelloHandler(tornado.web.RequestHandler):
+    def get(self):
+        self.write('hello')
+
+
+def get_app():
+    return tornado.web.Application([(r'/', HelloHandler)],
+                                   log_function=lambda handler: None)
+
+
+class App(TornadoHTTPContext):
+    def get_app(self):
+        return get_app()
+
+
+class SharedApp(App):
+    reuse_http_server = True
+
+
+class InProcessApp(App):
+    in_process_transport = True
+
+
+class Child(TornadoHTTPContext):
+    pass
+
+
+def own_server_cost(iterations):
+    start = time.time()
+    for _ in range(iterations):
+        context = App(None)
+        context.setup()
+        context.teardown()
+    return (time.time() - start) / iterations
+
+
+def child_cost(batch_class, iterations):
+    batch = batch_class(None)
+    batch.setup()
+    start = time.time()
+    for _ in range(iterations):
+        child = Child(batch)
+        child.setup()
+        child.teardown()
+    elapsed = time.time() - start
+    batch.teardown()
+    return elapsed / iterations
+
+
+def raw_tornado_cost(iterations):
+    io_loop = IOLoop.instance()
+    start = time.time()
+    for _ in range(iterations):
+        server = HTTPServer(get_app(), io_loop=io_loop)
+        sock, _ = bind_unused_port()
+        server.add_sockets([sock])
+        server.stop()
+    return (time.time() - start) / iterations
+
+
+def run(iterations=ITERATIONS):
+    return [
+        ('own_server', 'us/context', own_server_cost(iterations) * 1e6),
+        ('child_per_server', 'us/context', child_cost(App, iterations) * 1e6),
+        ('child_shared_server', 'us/context',
+         child_cost(SharedApp, iterations) * 1e6),
+        ('child_in_process', 'us/context',
+         child_cost(InProcessApp, iterations) * 1e6),
+        ('raw_tornado', 'us/context', raw_tornado_cost(iterations) * 1e6),
+    ]
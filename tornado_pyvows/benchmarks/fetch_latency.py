@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+"""
+Round-trip latency of ``fetch`` against the same request sent with the
+context's ``http_client`` on a bare ``IOLoop.start``/``stop`` cycle, over a
+TCP port, over a Unix domain socket (``unix_socket``) and with
+``in_process_transport``.
+"""
+
+import time
+
+from tornado_pyvows.benchmarks.context_setup import App, InProcessApp
+
+ITERATIONS = 500
+
+
+class UnixSocketApp(App):
+    unix_socket = True
+
+
+def percentile(latencies, percent):
+    latencies = sorted(latencies)
+    return latencies[int(percent / 100.0 * (len(latencies) - 1))]
+
+
+def measure(send, iterations):
+    send()  # warm up the connection and the handler
+    latencies = []
+    for _ in range(iterations):
+        start = time.time()
+        send()
+        latencies.append(time.time() - start)
+    return latencies
+
+
+def raw_fetch(context):
+    io_loop = context.io_loop
+    url = context.get_url('/')
+
+    def send():
+        context.http_client.fetch(url, lambda response: io_loop.stop())
+        io_loop.start()
+    return send
+
+
+def run(iterations=ITERATIONS):
+    results = []
+    for name, context_class in (('server', App),
+                                ('unix_socket', UnixSocketApp),
+                                ('in_process', InProcessApp)):
+        context = context_class(None)
+        context.setup()
+        try:
+            for kind, send in (
+                    ('fetch', lambda: context.fetch('/')),
+                    ('raw_tornado', raw_fetch(context))):
+                latencies = measure(send, iterations)
+                results.append(('%s_%s_mean' % (name, kind), 'us/request',
+                                sum(latencies) / len(latencies) * 1e6))
+                results.append(('%s_%s_p95' % (name, kind), 'us/request',
+                                percentile(latencies, 95) * 1e6))
+        finally:
+            context.teardown()
+    return results
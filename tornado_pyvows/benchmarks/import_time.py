@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+"""
+What ``import tornado_pyvows`` costs every process running vows (and every
+worker of ``tornado_pyvows.parallel``), measured in fresh interpreters,
+against importing the parts of Tornado and pyVows it cannot do without.
+"""
+
+import os
+import subprocess
+import sys
+
+import tornado_pyvows
+from tornado_pyvows import instrumentation
+
+ITERATIONS = 10
+
+BASELINE = ('tornado.httpclient', 'tornado.httpserver', 'tornado.web',
+            'pyvows')
+
+_SCRIPT = '''
+import sys, time
+modules = len(sys.modules)
+start = time.time()
+%s
+sys.stdout.write('%%r %%d' %% (time.time() - start,
+                               len(sys.modules) - modules))
+'''
+
+
+def import_cost(modules, iterations):
+    """Mean seconds and number of modules loaded to import ``modules`` in
+    a new interpreter."""
+    script = _SCRIPT % '\n'.join('import %s' % module for module in modules)
+    root = os.path.dirname(os.path.dirname(tornado_pyvows.__file__))
+    env = instrumentation.child_environ()
+    env['PYTHONPATH'] = os.pathsep.join(
+        [root] + filter(None, [env.get('PYTHONPATH')])
+    )
+    total = 0.0
+    for _ in range(iterations):
+        command = [sys.executable, '-c', script]
+        process = subprocess.Popen(command, env=env, stdout=subprocess.PIPE)
+        output = process.communicate()[0]
+        if process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, command)
+        elapsed, loaded = output.split()
+        total += float(elapsed)
+    return total / iterations, int(loaded)
+
+
+def run(iterations=ITERATIONS):
+    package, package_modules = import_cost(['tornado_pyvows'], iterations)
+    baseline, baseline_modules = import_cost(BASELINE, iterations)
+    return [
+        ('tornado_pyvows', 'ms/import', package * 1e3),
+        ('tornado_pyvows_modules', 'modules', package_modules),
+        ('baseline', 'ms/import', baseline * 1e3),
+        ('baseline_modules', 'modules', baseline_modules),
+    ]
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+"""
+Cost of creating, setting up and tearing down an
+``IsolatedTornadoHTTPContext``, with an application and server of its own
+and with its handler registered on the server of its parent
+(``pool_isolated_handlers``).
+"""
+
+import time
+
+from tornado_pyvows import IsolatedTornadoHTTPContext, TornadoHTTPContext
+from tornado_pyvows.benchmarks.context_setup import HelloHandler
+
+ITERATIONS = 200
+
+
+class Handlers(TornadoHTTPContext):
+    def get_handler_spec(self):
+        return (r'/', HelloHandler)
+
+    def get_application_settings(self):
+        return {'log_function': lambda handler: None}
+
+
+class PooledHandlers(Handlers):
+    pool_isolated_handlers = True
+
+
+class Isolated(IsolatedTornadoHTTPContext):
+    pass
+
+
+def creation_cost(parent_class, iterations):
+    parent = parent_class(None)
+    parent.setup()
+    start = time.time()
+    for _ in range(iterations):
+        context = Isolated(parent)
+        context.setup()
+        context.teardown()
+    elapsed = time.time() - start
+    parent.teardown()
+    return elapsed / iterations
+
+
+def run(iterations=ITERATIONS):
+    return [
+        ('own_server', 'us/context',
+         creation_cost(Handlers, iterations) * 1e6),
+        ('pooled', 'us/context',
+         creation_cost(PooledHandlers, iterations) * 1e6),
+    ]
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+"""
+Throughput of the two ways ``post(multipart=True)`` encodes a body: in
+memory through ``urllib3`` and streamed from a file by a
+``MultipartEncoder``.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+from urllib3.filepost import encode_multipart_formdata
+
+from tornado_pyvows.multipart import MultipartEncoder, UploadedFile
+
+ITERATIONS = 20
+SIZE = 1024 * 1024
+CURL_READ_SIZE = 16 * 1024
+
+
+def throughput(encode, iterations):
+    start = time.time()
+    for _ in range(iterations):
+        encode()
+    return SIZE * iterations / (time.time() - start) / (1024 * 1024)
+
+
+def stream(encoder):
+    # the way curl reads the body of a streamed upload
+    while encoder.read(CURL_READ_SIZE):
+        pass
+
+
+def run(iterations=ITERATIONS):
+    content = os.urandom(SIZE)
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'upload.bin')
+        with open(path, 'wb') as upload:
+            upload.write(content)
+        fields = {'name': 'value', 'file': ('upload.bin', content)}
+        return [
+            ('in_memory', 'MB/s', throughput(
+                lambda: encode_multipart_formdata(fields), iterations)),
+            ('streamed', 'MB/s', throughput(
+                lambda: stream(MultipartEncoder({
+                    'name': 'value', 'file': UploadedFile(path)
+                })), iterations)),
+        ]
+    finally:
+        shutil.rmtree(directory)
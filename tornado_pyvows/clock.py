@@ -0,0 +1,126 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import contextlib
+import datetime
+import heapq
+import time
+
+from tornado import stack_context
+from tornado.ioloop import IOLoop, _Timeout
+
+
+class FakeClockIOLoop(IOLoop):
+    """
+    An ``IOLoop`` whose timeouts follow a virtual clock instead of the wall
+    clock: they only fire when ``advance`` moves the clock past their
+    deadline. I/O and callbacks run as usual.
+
+    The clock, returned by ``time``, starts at the current time and stands
+    still otherwise, so deadlines have to be computed from it (or given as
+    ``datetime.timedelta``) to be deterministic.
+
+    While it runs the loop is ``IOLoop.instance()``, so handlers scheduling
+    through the global instance follow the virtual clock as well.
+    """
+
+    #: Seconds of I/O ``run_io_until`` runs between two checks.
+    io_slice = 0.005
+
+    def __init__(self, *args, **kwargs):
+        IOLoop.__init__(self, *args, **kwargs)
+        self._now = time.time()
+        self._virtual_timeouts = []
+
+    def time(self):
+        return self._now
+
+    def add_timeout(self, deadline, callback):
+        if isinstance(deadline, datetime.timedelta):
+            deadline = self._now + _Timeout.timedelta_to_seconds(deadline)
+        timeout = _Timeout(deadline, stack_context.wrap(callback))
+        heapq.heappush(self._virtual_timeouts, timeout)
+        return timeout
+
+    @contextlib.contextmanager
+    def installed(self):
+        """Makes this loop ``IOLoop.instance()`` until the block exits, then
+        puts the previous instance (if any) back."""
+        previous = getattr(IOLoop, '_instance', None)
+        IOLoop._instance = self
+        try:
+            yield self
+        finally:
+            if previous is None:
+                del IOLoop._instance
+            else:
+                IOLoop._instance = previous
+
+    def start(self):
+        # only while running: other contexts, running in between, keep the
+        # instance they know
+        with self.installed():
+            IOLoop.start(self)
+
+    def add_wall_clock_timeout(self, deadline, callback):
+        """Schedules ``callback`` on the real clock, e.g. to stop waiting
+        for I/O that never comes."""
+        return IOLoop.add_timeout(self, deadline, callback)
+
+    def pending_timeouts(self):
+        """Number of virtual timeouts still to fire."""
+        return len([timeout for timeout in self._virtual_timeouts
+                    if timeout.callback is not None])
+
+    def run_until_idle(self):
+        """Runs the loop until there are no callbacks left to run."""
+        while self._callbacks:
+            self.add_callback(self.stop)
+            self.start()
+
+    def run_io_until(self, condition=None, timeout=5):
+        """
+        Runs I/O and callbacks, without moving the clock, until
+        ``condition()`` holds: by default until a new timeout was scheduled,
+        e.g. by the handler a request was sent to. Raises ``AssertionError``
+        when ``timeout`` seconds of wall clock went by first.
+        """
+        if condition is None:
+            scheduled = self.pending_timeouts()
+            condition = lambda: self.pending_timeouts() > scheduled
+        deadline = time.time() + timeout
+        while not condition():
+            if time.time() >= deadline:
+                raise AssertionError(
+                    'Condition not met after %s seconds of I/O' % timeout
+                )
+            handle = self.add_wall_clock_timeout(time.time() + self.io_slice,
+                                                 self.stop)
+            self.start()
+            self.remove_timeout(handle)
+
+    def advance(self, seconds):
+        """
+        Moves the clock ``seconds`` forward, firing the timeouts that are due
+        in deadline order (with the clock set to their deadline), including
+        the ones they schedule within that time.
+        """
+        target = self._now + seconds
+        timeouts = self._virtual_timeouts
+        while True:
+            self.run_until_idle()
+            while timeouts and timeouts[0].callback is None:
+                heapq.heappop(timeouts)
+            if not timeouts or timeouts[0].deadline > target:
+                break
+            timeout = heapq.heappop(timeouts)
+            self._now = max(self._now, timeout.deadline)
+            self.add_callback(timeout.callback)
+        self._now = max(self._now, target)
@@ -11,24 +11,212 @@
 import sys
 import time
 import contextlib
+import collections
+import copy
+import functools
+import heapq
+import itertools
+import os
+import shutil
+import tempfile
 import urllib
+import weakref
 
 import tornado.ioloop
+from tornado import gen
 from tornado.httpclient import AsyncHTTPClient
 from tornado.httpserver import HTTPServer
+from tornado.netutil import bind_unix_socket
 from tornado.stack_context import NullContext
-from tornado.testing import get_unused_port
 from tornado.web import Application, URLSpec
 from pyvows import Vows
 
-from urllib3.filepost import encode_multipart_formdata
+from tornado_pyvows import fixtures
+from tornado_pyvows import instrumentation
+from tornado_pyvows import memory
+from tornado_pyvows import profiling
+from tornado_pyvows import topics
+from tornado_pyvows.clock import FakeClockIOLoop
+from tornado_pyvows.multipart import (
+    MultipartEncoder,
+    is_streamed,
+    prepare_curl_upload
+)
+from tornado_pyvows.ports import bind_unused_port
+from tornado_pyvows.response import Response
+from tornado_pyvows.standin import StandIn
+from tornado_pyvows.streaming import ResponseStream
+from tornado_pyvows.transport import InProcessHTTPClient
+
+
+_missing = object()
+
+
+class IsolatedHandlerRouter(object):
+    """
+    Used as the handler class of the ``Application`` of a context with
+    ``pool_isolated_handlers``: each request is handled by the isolated
+    handler registered under the routing key sent in the ``header``, or by
+    ``default_handler`` when there is none.
+    """
+    header = 'X-Tornado-Pyvows-Isolation-Key'
+
+    def __init__(self, default_handler, spec=None, settings=None):
+        self.default_handler = default_handler
+        #: the ``(pattern, handler, kwargs)`` and application settings the
+        #: router was built for; only contexts with the same can use it
+        self.spec = spec
+        self.settings = settings
+        self.handlers = {}
+        self._keys = itertools.count(1)
+
+    def serves(self, spec, settings):
+        return spec == self.spec and settings == self.settings
+
+    def register(self, handler):
+        key = str(next(self._keys))
+        self.handlers[key] = handler
+        return key
+
+    def unregister(self, key):
+        self.handlers.pop(key, None)
+
+    def __call__(self, application, request, **kwargs):
+        handler = self.handlers.get(
+            request.headers.get(self.header), self.default_handler
+        )
+        return handler(application, request, **kwargs)
+
+
+#: The ``initialize`` arguments of the HTTP clients that they keep under the
+#: same name, passed on by ``resize_http_client``.
+_CLIENT_OPTIONS = ('hostname_mapping', 'max_buffer_size', 'socket_path')
+
+
+def get_max_clients(http_client):
+    """The number of requests ``http_client`` sends at once, or None when it
+    has no limit. Curl clients only keep it as their number of handles."""
+    max_clients = getattr(http_client, 'max_clients', None)
+    if max_clients is None and hasattr(http_client, '_curls'):
+        max_clients = len(http_client._curls)
+    return max_clients
+
+
+def resize_http_client(http_client, max_clients):
+    """A new instance of the class of ``http_client``, configured the same
+    way but sending up to ``max_clients`` requests at once; the caller
+    closes it."""
+    options = dict((name, getattr(http_client, name))
+                   for name in _CLIENT_OPTIONS if hasattr(http_client, name))
+    return type(http_client)(
+        io_loop=http_client.io_loop, max_clients=max_clients,
+        force_instance=True, **options
+    )
+
+
+#: Tornado 4.0 made the IOLoop compact its heap of timeouts itself.
+_COMPACT_TIMEOUTS = tornado.version_info < (4, 0)
+_MIN_COMPACT_SIZE = 512
+_compact_at = weakref.WeakKeyDictionary()
+
+
+def _cancel_timeout(io_loop, timeout):
+    """
+    Cancels ``timeout``. Before Tornado 4.0 the IOLoop only drops cancelled
+    timeouts once their deadline is reached, so its (private) heap is
+    compacted here whenever they make up most of it: otherwise every
+    ``wait`` of a long run leaves an entry behind.
+    """
+    io_loop.remove_timeout(timeout)
+    if not _COMPACT_TIMEOUTS:
+        return
+    timeouts = getattr(io_loop, '_timeouts', None)
+    if timeouts is None:
+        # not a loop keeping the heap, e.g. TwistedIOLoop
+        return
+    if len(timeouts) >= _compact_at.get(io_loop, _MIN_COMPACT_SIZE):
+        timeouts[:] = [t for t in timeouts if t.callback is not None]
+        heapq.heapify(timeouts)
+        _compact_at[io_loop] = max(_MIN_COMPACT_SIZE, 2 * len(timeouts))
+
+
+@contextlib.contextmanager
+def _not_installed():
+    yield
 
 
 class AsyncTestCase(object):
 
+    stopped = False
+    running = False
+    failure = None
+    stop_args = None
+
+    # the condition given to the ``wait`` in progress, checked by ``stop``
+    _wait_condition = None
+
+    #: How long the IOLoop may run for a topic returning a ``Future`` or
+    #: yielding ``tornado.gen`` objects (see ``tornado_pyvows.topics``).
+    async_topic_timeout = 5
+
+    #: When True, the context runs on an IOLoop of its own whose timeouts
+    #: follow a virtual clock, moved forward with ``advance``.
+    fake_clock = False
+
     def get_new_ioloop(self):
+        if self.fake_clock:
+            return FakeClockIOLoop()
         return tornado.ioloop.IOLoop.instance()
 
+    def advance(self, seconds):
+        """Moves the virtual clock of a ``fake_clock`` context forward,
+        running the timeouts that become due."""
+        self.io_loop.advance(seconds)
+
+    def run_until_idle(self):
+        self.io_loop.run_until_idle()
+
+    def run_io_until(self, condition=None, timeout=5):
+        """Runs the I/O of a ``fake_clock`` context until ``condition()``
+        holds, by default until a timeout was scheduled; see
+        ``FakeClockIOLoop.run_io_until``."""
+        self.io_loop.run_io_until(condition, timeout)
+
+    def _installed_clock(self):
+        if isinstance(self.io_loop, FakeClockIOLoop):
+            return self.io_loop.installed()
+        return _not_installed()
+
+    def _close_fake_clock_ioloop(self):
+        if self.fake_clock and 'io_loop' in vars(self):
+            self.io_loop.close(all_fds=True)
+
+    def _wrap_topic(self):
+        topic = getattr(type(self), 'topic', None)
+        if topic is None:
+            return
+        topic = getattr(topic, 'im_func', topic)
+        wrapper_type = getattr(topic, '_wrapper_type', None)
+        if wrapper_type == 'async_topic':
+            # pyVows drives callback based topics itself
+            return
+        original = getattr(topic, '_original', topic)
+
+        @functools.wraps(original)
+        def resolved_topic(*args):
+            try:
+                with self._installed_clock():
+                    return topics.resolve(
+                        self, original(self, *args), self.async_topic_timeout
+                    )
+            except Exception as error:
+                if wrapper_type == 'capture_error':
+                    return error
+                raise
+        # lets pyVows find the parent topics the original one expects
+        resolved_topic._original = original
+        self.topic = resolved_topic
+
     @contextlib.contextmanager
     def stack_context(self):
         try:
@@ -40,32 +228,28 @@ class AsyncTestCase(object):
     def stop(self, _arg=None, **kwargs):
         assert _arg is None or not kwargs
         self.stop_args = kwargs or _arg
-        if self.running:
+        self.stopped = True
+        if self.running and self._is_wait_over():
             self.io_loop.stop()
             self.running = False
-        self.stopped = True
+
+    def _is_wait_over(self):
+        condition = self._wait_condition
+        return self.failure is not None or condition is None or condition()
 
     def wait(self, condition=None, timeout=5):
-        if not self.stopped:
-            if timeout:
-                def timeout_func():
-                    try:
-                        raise AssertionError(
-                            'Async operation timed out after %d seconds' %
-                            timeout
-                        )
-                    except:
-                        self.failure = sys.exc_info()
-                    self.stop()
-                self.io_loop.add_timeout(time.time() + timeout, timeout_func)
-            while True:
-                self.running = True
-                with NullContext():
-                    self.io_loop.start()
-                if (self.failure is not None or
-                        condition is None or condition()):
-                    break
-        assert self.stopped
+        """
+        Runs the IOLoop until ``stop`` is called (and ``condition``, if
+        given, holds) or ``timeout`` seconds went by, returning what was
+        given to ``stop``. The loop is started once per call: ``stop`` only
+        stops it when the wait is over.
+        """
+        self._wait_condition = condition
+        try:
+            if not (self.stopped and self._is_wait_over()):
+                self._run_until_stopped(timeout)
+        finally:
+            self._wait_condition = None
         self.stopped = False
         if self.failure is not None:
             raise self.failure[0], self.failure[1], self.failure[2]
@@ -73,13 +257,105 @@ class AsyncTestCase(object):
         self.stop_args = None
         return result
 
+    def _run_until_stopped(self, timeout):
+        handle = None
+        if timeout:
+            def timeout_func():
+                try:
+                    raise AssertionError(
+                        'Async operation timed out after %d seconds' %
+                        timeout
+                    )
+                except:
+                    self.failure = sys.exc_info()
+                instrumentation.increment(self, 'timeouts')
+                self.stop()
+            # the wait itself is limited in real time even on a fake clock
+            add_timeout = getattr(self.io_loop, 'add_wall_clock_timeout',
+                                  self.io_loop.add_timeout)
+            handle = add_timeout(time.time() + timeout, timeout_func)
+        self.running = True
+        instrumentation.increment(self, 'ioloop_cycles')
+        try:
+            with instrumentation.timed(self, 'wait'):
+                with NullContext():
+                    self.io_loop.start()
+        finally:
+            self.running = False
+            if handle is not None:
+                _cancel_timeout(self.io_loop, handle)
+
 
 class AsyncHTTPTestCase(AsyncTestCase):
+
+    #: When True, the context that creates the ``app`` starts a single
+    #: ``HTTPServer`` that is shared by all of its descendant contexts and
+    #: only stopped when that outermost context is torn down.
+    reuse_http_server = False
+
+    #: When True, requests are handed straight to the ``app`` of the context
+    #: (and of its descendants) instead of going through an ``HTTPServer``.
+    in_process_transport = False
+
+    #: When True on the context defining ``get_handler_spec``, its
+    #: ``IsolatedTornadoHTTPContext`` children do not build an application
+    #: and server of their own. Their isolated handler is registered on the
+    #: server of this context instead and picked through a routing key sent
+    #: with each request.
+    pool_isolated_handlers = False
+
+    #: When True, ``http_client`` is a curl based client that keeps the
+    #: connections to the servers alive and counts them in its ``stats``.
+    keep_alive_http_client = False
+
+    #: When True, ``get_app`` is called once per batch: the contexts of the
+    #: batch sharing the same ``get_app`` get the same application, with
+    #: the state returned by ``get_app_state`` put back as it was right
+    #: after it was built.
+    memoize_app = False
+
+    #: When True, the server of the context that creates the ``app`` listens
+    #: on a Unix domain socket in a temporary directory instead of a TCP
+    #: port, and ``http_client`` (curl based) sends the requests for the
+    #: ``get_url`` URLs through it.
+    unix_socket = False
+
+    #: When True on the context that creates the ``app``, its ``HTTPServer``
+    #: (and those of its descendants) is only started, and its port only
+    #: picked, on the first ``get_url`` call (``fetch`` and the HTTP verb
+    #: methods call it): contexts that never send a request skip it. Read
+    #: ``port`` and ``http_server`` after that call. ``http_client`` is
+    #: still created by ``setup``.
+    lazy_http_server = False
+
+    #: The ``profile`` option of every ``fetch`` (and HTTP verb method) that
+    #: does not give one: True to sample the stacks of the requests being
+    #: handled, ``'cprofile'`` to run ``cProfile``.
+    profile_requests = False
+
+    #: Seconds the stand-in of ``get_cassette`` waits before each response,
+    #: instead of the latency recorded in the cassette.
+    stand_in_latency = None
+
+    #: Base URL of the real service the stand-in of ``get_cassette`` sends
+    #: the requests it has no recorded response for, recording them.
+    stand_in_target = None
+
     def initialize_ioloop(self):
         self.io_loop = self.get_new_ioloop()
-        self.http_client = AsyncHTTPClient(io_loop=self.io_loop)
+        if self.keep_alive_http_client:
+            from tornado_pyvows.keepalive import KeepAliveHTTPClient
+            self.http_client = KeepAliveHTTPClient(io_loop=self.io_loop)
+        else:
+            self.http_client = AsyncHTTPClient(io_loop=self.io_loop)
 
     def setup(self):
+        memory.before_setup(self)
+        with instrumentation.timed(self, 'setup'):
+            self._setup()
+            self._start_stand_in()
+
+    def _setup(self):
         self.stopped = False
         self.running = False
         self.failure = None
@@ -87,7 +363,7 @@ class AsyncHTTPTestCase(AsyncTestCase):
 
         if 'get_app' in dir(self.__class__):
             self.initialize_ioloop()
-            self.app = self.get_app()
+            self.app = self._get_app()
         elif hasattr(self, 'get_handler_spec') and self.get_handler_spec:
             spec = self.get_handler_spec()
             if spec:
@@ -105,52 +381,322 @@ class AsyncHTTPTestCase(AsyncTestCase):
                 # create an isolated version of the handler
                 self.isolated_handler = type('IsolatedHandler', (handler,), {})
 
+                settings = self.get_application_settings()
+                router = self.get_parent_argument('isolated_handler_router')
+                if (router is not None and
+                        router.serves((pattern, handler, kwargs), settings)):
+                    self.isolation_key = router.register(self.isolated_handler)
+                    return
+
                 self.initialize_ioloop()
 
+                handler_class = self.isolated_handler
+                if self.pool_isolated_handlers:
+                    handler_class = IsolatedHandlerRouter(
+                        handler_class, (pattern, handler, kwargs), settings
+                    )
+                    self.isolated_handler_router = handler_class
+
                 self.app = Application([
-                    (pattern, self.isolated_handler, kwargs)
-                ], self.get_application_settings())
+                    (pattern, handler_class, kwargs)
+                ], settings)
+
+        owner = self._get_app_owner()
+        if owner is not None and owner.in_process_transport:
+            if owner is self:
+                self.http_client = InProcessHTTPClient(self.app, self.io_loop)
+            return
+
+        if self._is_sharing_http_server():
+            return
 
         if self.app:
-            self.port = get_unused_port()
-            self.http_server = HTTPServer(
-                self.app,
-                io_loop=self.io_loop,
-                **self.get_httpserver_options()
-            )
-            self.http_server.listen(self.port, address="0.0.0.0")
+            if owner.unix_socket:
+                self._prepare_unix_socket()
+            if owner.lazy_http_server:
+                self._http_server_pending = True
+            else:
+                self._start_http_server()
+
+    def _start_http_server(self):
+        self._http_server_pending = False
+        if 'socket_path' in vars(self):
+            sock = bind_unix_socket(self.socket_path)
+        else:
+            sock, self.port = bind_unused_port()
+        self.http_server = HTTPServer(
+            self.app,
+            io_loop=self.io_loop,
+            **self.get_httpserver_options()
+        )
+        self.http_server.add_sockets([sock])
+
+    def _ensure_http_server(self):
+        context = self
+        while context is not None:
+            context_vars = vars(context)
+            if context_vars.get('_http_server_pending'):
+                context._start_http_server()
+                return
+            if 'http_server' in context_vars:
+                return
+            context = context.parent
+
+    def _prepare_unix_socket(self):
+        from tornado_pyvows.unixsocket import UnixSocketHTTPClient
+        self.socket_dir = tempfile.mkdtemp(prefix='tornado_pyvows')
+        self.socket_path = os.path.join(self.socket_dir, 'http.sock')
+        # makes get_url build http://localhost/... URLs
+        self.port = None
+        self.http_client = UnixSocketHTTPClient(
+            io_loop=self.io_loop, socket_path=self.socket_path,
+            force_instance=True
+        )
 
-    def fetch(self, path, **kwargs):
+    def _get_app(self):
+        if not self.memoize_app:
+            return self.get_app()
+
+        root = self
+        while root.parent is not None:
+            root = root.parent
+        apps = vars(root).setdefault('_memoized_apps', {})
+        factory = getattr(type(self).get_app, 'im_func', type(self).get_app)
+        if factory not in apps:
+            app = self.get_app()
+            state = self.get_app_state(app)
+            snapshot = None
+            if state is not None:
+                snapshot = self.copy_app_state(state)
+            apps[factory] = (app, state, snapshot)
+            return app
+
+        app, state, snapshot = apps[factory]
+        if state is not None:
+            fixtures.restore(state, self.copy_app_state(snapshot))
+        return app
+
+    def get_cassette(self):
+        """
+        Returns a ``tornado_pyvows.standin.Cassette`` (or the filename of
+        one) to start a ``StandIn`` serving its recorded responses, as
+        ``stand_in``, for vows on HTTP clients of external services.
+        """
+        return None
+
+    def _start_stand_in(self):
+        cassette = self.get_cassette()
+        if cassette is None:
+            return
+        if self.io_loop is None:
+            self.initialize_ioloop()
+        self.stand_in = StandIn(
+            cassette, self.io_loop,
+            latency=self.stand_in_latency, target=self.stand_in_target
+        ).start()
+
+    def get_app_state(self, app):
+        """
+        Returns the mutable state of a memoized ``app`` (a dict, list, set,
+        object or a tuple of them) to put back in place before each context
+        reuses it.
+        """
+        return None
+
+    def copy_app_state(self, state):
+        """Copies the state returned by ``get_app_state``, both to keep the
+        pristine snapshot and to restore it. Override it when a shallow
+        copy is enough."""
+        return copy.deepcopy(state)
+
+    def _get_app_owner(self):
+        context = self
+        while context is not None:
+            if 'app' in vars(context):
+                return context
+            context = context.parent
+        return None
+
+    def _is_sharing_http_server(self):
+        owner = self._get_app_owner()
+        return (owner is not None and owner is not self and
+                (owner.reuse_http_server or owner.pool_isolated_handlers) and
+                ('http_server' in vars(owner) or
+                 '_http_server_pending' in vars(owner)))
+
+    def _add_isolation_key(self, kwargs):
+        key = getattr(self, 'isolation_key', None)
+        if key is not None:
+            headers = dict(kwargs.get('headers') or {})
+            headers[IsolatedHandlerRouter.header] = key
+            kwargs['headers'] = headers
+        return kwargs
+
+    def fetch(self, path, profile=None, **kwargs):
         """
         Simple wrapper around ``http_client``. If the given ``path`` doesn't
         start with 'http' than ``path`` is passed on to the
-        ``http_client.fetch``
+        ``http_client.fetch``. The response is a
+        ``tornado_pyvows.response.Response``, caching its ``json`` and
+        ``text``.
+
+        :param profile:
+            Profiles everything that runs while waiting for the response,
+            the handler included, attaching the result to the response as
+            ``profile``: True (or the sampling interval in seconds) for a
+            ``tornado_pyvows.profiling.SampledProfile``, ``'cprofile'`` for
+            a ``pstats.Stats``. Defaults to ``profile_requests``.
+        """
+        if profile is None:
+            profile = self.profile_requests
+        profiler = profiling.get_profiler(profile)
+        kwargs = self._add_isolation_key(kwargs)
+        with instrumentation.timed(self, 'fetch'):
+            with profiling.profiled(profiler):
+                self.http_client.fetch(self.get_url(path), self.stop,
+                                       **kwargs)
+                response = Response.wrap(self.wait())
+        if profiler is not None:
+            response.profile = profiler.result()
+        return response
+
+    def async_fetch(self, path, **kwargs):
+        """
+        Returns a ``gen.Task`` fetching ``path`` for topics yielding
+        ``tornado.gen`` objects; yield a list of them to send the requests
+        at the same time.
         """
-        self.http_client.fetch(self.get_url(path), self.stop, **kwargs)
-        return self.wait()
+        kwargs = self._add_isolation_key(kwargs)
+        url = self.get_url(path)
+
+        def fetch(callback):
+            self.http_client.fetch(
+                url, lambda response: callback(Response.wrap(response)),
+                **kwargs
+            )
+        return gen.Task(fetch)
+
+    def stream(self, path, **kwargs):
+        """
+        Fetches ``path`` returning a ``ResponseStream`` that yields the body
+        chunks as they arrive instead of buffering the whole body, e.g.::
+
+            digest = self.stream('/big-file').digest('sha1', contains=['EOF'])
+
+        The default ``SimpleAsyncHTTPClient`` only delivers chunked responses
+        piece by piece; use ``keep_alive_http_client`` (curl) to stream
+        responses with a ``Content-Length`` in constant memory too.
+        """
+        kwargs = self._add_isolation_key(kwargs)
+        return ResponseStream(self, self.get_url(path), **kwargs)
+
+    def fetch_many(self, requests, concurrency=None, timeout=5, **kwargs):
+        """
+        Sends all the given ``requests`` at once on the IOLoop and waits for
+        all of them, returning the responses in the same order.
+
+        :param requests:
+            Each item is either a ``path`` or a ``(path, kwargs)`` tuple. The
+            ``kwargs`` given to ``fetch_many`` are the defaults for all of
+            them.
+        :param concurrency:
+            Maximum number of requests in flight. Defaults to the
+            limit of ``http_client`` (see ``get_max_clients``), which
+            queues any requests above it anyway.
+        """
+        pending = collections.deque()
+        for index, request in enumerate(requests):
+            if isinstance(request, tuple):
+                path, request_kwargs = request
+            else:
+                path, request_kwargs = request, {}
+            options = dict(kwargs)
+            options.update(request_kwargs)
+            pending.append((index, path, self._add_isolation_key(options)))
+
+        if not pending:
+            return []
+        if concurrency is None:
+            concurrency = get_max_clients(self.http_client)
+
+        responses = [None] * len(pending)
+        remaining = [len(pending)]
+
+        def send():
+            index, path, options = pending.popleft()
+            self.http_client.fetch(
+                self.get_url(path),
+                functools.partial(on_response, index),
+                **options
+            )
+
+        def on_response(index, response):
+            responses[index] = Response.wrap(response)
+            remaining[0] -= 1
+            if pending:
+                send()
+            elif not remaining[0]:
+                self.stop(responses)
+
+        with instrumentation.timed(self, 'fetch'):
+            for _ in range(min(concurrency or len(pending), len(pending))):
+                send()
+            return self.wait(timeout=timeout)
 
     def get_httpserver_options(self):
         return {}
 
     def get_url(self, path):
         if not path.startswith('http'):
+            self._ensure_http_server()
+            if self.port is None:
+                return 'http://localhost%s' % path
             return 'http://localhost:%s%s' % (self.port, path)
         return path
 
     def teardown(self):
-        if 'http_server' in dir(self.__class__):
+        with instrumentation.timed(self, 'teardown'):
+            self._teardown()
+        memory.after_teardown(self)
+
+    def _teardown(self):
+        if 'stand_in' in vars(self):
+            self.stand_in.stop()
+        if 'isolation_key' in vars(self):
+            self.isolated_handler_router.unregister(self.isolation_key)
+        if 'http_server' in vars(self):
             self.http_server.stop()
         if 'http_client' in dir(self.__class__):
             self.http_client.close()
+        if 'socket_dir' in vars(self):
+            self.http_client.close()
+            shutil.rmtree(self.socket_dir, ignore_errors=True)
+        self._close_fake_clock_ioloop()
 
 
 class ParentAttributeMixin(object):
 
+    # bumped whenever any context sets or deletes the attribute, so cached
+    # parent lookups of that name know they may be stale
+    _attribute_generations = collections.defaultdict(int)
+
     def get_parent_argument(self, name):
+        cache = self.__dict__.setdefault('_parent_attribute_cache', {})
+        generation = ParentAttributeMixin._attribute_generations[name]
+        cached = cache.get(name)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+
+        value = self._find_parent_argument(name)
+        cache[name] = (generation, value)
+        return value
+
+    def _find_parent_argument(self, name):
         parent = self.parent
         while parent:
-            if hasattr(parent, name):
-                return getattr(parent, name)
+            value = getattr(parent, name, _missing)
+            if value is not _missing:
+                return value
             parent = parent.parent
 
         return None
@@ -161,6 +707,14 @@ class ParentAttributeMixin(object):
         except AttributeError:
             return self.get_parent_argument(name)
 
+    def __setattr__(self, name, value):
+        ParentAttributeMixin._attribute_generations[name] += 1
+        super(ParentAttributeMixin, self).__setattr__(name, value)
+
+    def __delattr__(self, name):
+        ParentAttributeMixin._attribute_generations[name] += 1
+        super(ParentAttributeMixin, self).__delattr__(name)
+
 
 class TornadoContext(Vows.Context, AsyncTestCase, ParentAttributeMixin):
 
@@ -168,14 +722,30 @@ class TornadoContext(Vows.Context, AsyncTestCase, ParentAttributeMixin):
         Vows.Context.__init__(self, parent)
         ParentAttributeMixin.__init__(self)
         AsyncTestCase(*args, **kwargs)
+        self._wrap_topic()
 
         super(TornadoContext, self).ignore(
             'get_parent_argument',
-            'get_app', 'fetch', 'get_httpserver_options',
+            'get_app', 'fetch', 'fetch_many', 'async_fetch', 'stream',
+            'get_httpserver_options',
             'get_url', 'initialize_ioloop',
-            'get_new_ioloop', 'stack_context', 'stop', 'wait'
+            'get_new_ioloop', 'stack_context', 'stop', 'wait',
+            'advance', 'run_until_idle', 'run_io_until'
         )
 
+    def setup(self):
+        memory.before_setup(self)
+        with instrumentation.timed(self, 'setup'):
+            if self.fake_clock or self.io_loop is None:
+                self.io_loop = self.get_new_ioloop()
+            Vows.Context.setup(self)
+
+    def teardown(self):
+        with instrumentation.timed(self, 'teardown'):
+            Vows.Context.teardown(self)
+            self._close_fake_clock_ioloop()
+        memory.after_teardown(self)
+
 
 class TornadoHTTPContext(Vows.Context, AsyncHTTPTestCase, ParentAttributeMixin):
 
@@ -183,11 +753,15 @@ class TornadoHTTPContext(Vows.Context, AsyncHTTPTestCase, ParentAttributeMixin):
         Vows.Context.__init__(self, parent)
         ParentAttributeMixin.__init__(self)
         AsyncHTTPTestCase.__init__(self, *args, **kwargs)
+        self._wrap_topic()
 
         super(TornadoHTTPContext, self).ignore(
             'get_parent_argument',
-            'get_app', 'fetch', 'get_httpserver_options',
+            'get_app', 'fetch', 'fetch_many', 'async_fetch', 'stream',
+            'get_httpserver_options',
             'get_url', 'get_new_ioloop', 'stack_context', 'stop',
+            'get_app_state', 'copy_app_state', 'advance', 'run_until_idle',
+            'run_io_until', 'get_cassette',
             'wait', 'get', 'post', 'delete', 'head', 'put',
             'get_handler_spec', 'get_application_settings',
             'get_test_handler', 'initialize_ioloop'
@@ -212,7 +786,7 @@ class TornadoHTTPContext(Vows.Context, AsyncHTTPTestCase, ParentAttributeMixin):
         return self.fetch(path, method="GET", **kwargs)
 
     def delete(self, path, **kwargs):
-        return self.fetch(path, method="DELETE")
+        return self.fetch(path, method="DELETE", **kwargs)
 
     def put(self, path, **kwargs):
         return self.fetch(path, method="PUT", **kwargs)
@@ -229,26 +803,46 @@ class TornadoHTTPContext(Vows.Context, AsyncHTTPTestCase, ParentAttributeMixin):
             ``urllib3``
             If the value is a tuple of two elements, then the first element is
             treated as the filename of the form-data section.
+            Values may also be file-like objects, ``(filename, file)`` tuples
+            or ``tornado_pyvows.multipart.UploadedFile`` instances; the body
+            is then produced by a ``MultipartEncoder`` and, with a curl based
+            ``http_client``, read from the files while it is being sent.
         """
         body = None
-        headers = {}
-        if multipart:
+        headers = dict(kwargs.pop('headers', None) or {})
+        if multipart and any(is_streamed(value) for value in data.values()):
+            encoder = MultipartEncoder(data)
+            headers["Content-Type"] = encoder.content_type
+            kwargs.update(self._get_streamed_body(encoder))
+        elif multipart:
+            from urllib3.filepost import encode_multipart_formdata
             body, content_type = encode_multipart_formdata(data)
             headers["Content-Type"] = content_type
         else:
             body = urllib.urlencode(data, doseq=True)
 
-        if 'headers' in kwargs:
-            kwargs['headers'].update(headers)
-
+        kwargs.setdefault('body', body)
         return self.fetch(
             path,
             method="POST",
-            body=body,
             headers=headers,
             **kwargs
         )
 
+    def _get_streamed_body(self, encoder):
+        try:
+            from tornado.curl_httpclient import CurlAsyncHTTPClient
+        except ImportError:
+            CurlAsyncHTTPClient = None
+        if (CurlAsyncHTTPClient is not None and
+                isinstance(self.http_client, CurlAsyncHTTPClient)):
+            return {
+                'body': '',
+                'prepare_curl_callback': prepare_curl_upload(encoder)
+            }
+        # the other clients can only send a body held in memory
+        return {'body': encoder.read()}
+
 
 class IsolatedTornadoHTTPContext(TornadoHTTPContext):
 
@@ -0,0 +1,37 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+"""
+Helpers for ``memoize_app``: the mutable state of a memoized application is
+put back in place, so the handlers, settings and ``initialize`` kwargs that
+hold references to it see the pristine version again.
+"""
+
+
+def restore(state, snapshot):
+    """
+    Makes ``state`` equal to ``snapshot`` in place. ``state`` is a dict, a
+    list, a set, an object (whose attributes are replaced) or a tuple of
+    those, restored item by item.
+    """
+    if isinstance(state, tuple):
+        for item, item_snapshot in zip(state, snapshot):
+            restore(item, item_snapshot)
+    elif isinstance(state, dict):
+        state.clear()
+        state.update(snapshot)
+    elif isinstance(state, list):
+        state[:] = snapshot
+    elif isinstance(state, set):
+        state.clear()
+        state.update(snapshot)
+    else:
+        vars(state).clear()
+        vars(state).update(vars(snapshot))
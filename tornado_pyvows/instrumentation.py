@@ -0,0 +1,173 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+"""
+Opt-in timing of the contexts' ``setup``, ``fetch``, ``wait`` (each IOLoop
+run) and ``teardown``. Set the ``TORNADO_PYVOWS_TIMINGS`` environment
+variable to the file the JSON report should be written to; a summary of the
+``TORNADO_PYVOWS_SLOWEST`` (default 10) slowest contexts is printed to
+stderr when the run finishes::
+
+    $ env TORNADO_PYVOWS_TIMINGS=timings.json PYTHONPATH=. pyvows vows/
+"""
+
+import atexit
+import contextlib
+import json
+import os
+import sys
+import time
+
+#: The environment variables turning the reports of this module and of
+#: ``tornado_pyvows.memory`` on.
+REPORT_VARIABLES = (
+    'TORNADO_PYVOWS_TIMINGS',
+    'TORNADO_PYVOWS_SLOWEST',
+    'TORNADO_PYVOWS_MEMORY',
+    'TORNADO_PYVOWS_MEMORY_TOP',
+)
+
+_timings = {}
+_enabled = False
+
+
+def context_path(context):
+    names = []
+    while context is not None:
+        names.append(type(context).__name__)
+        context = context.parent
+    return '.'.join(reversed(names))
+
+
+def get_timings(context):
+    return _get_path_timings(context_path(context))
+
+
+def _get_path_timings(path):
+    if path not in _timings:
+        _timings[path] = {
+            'setup': 0.0,
+            'teardown': 0.0,
+            'fetch': [],
+            'wait': [],
+            'ioloop_cycles': 0,
+            'timeouts': 0,
+        }
+    return _timings[path]
+
+
+def is_enabled():
+    return _enabled
+
+
+def pop_timings():
+    """Returns the timings recorded so far and forgets them, for a worker
+    process to send them to the one writing the report."""
+    global _timings
+    timings, _timings = _timings, {}
+    return timings
+
+
+def merge(timings):
+    """Adds the timings returned by ``pop_timings`` in another process."""
+    for path, recorded in timings.items():
+        current = _get_path_timings(path)
+        for name, value in recorded.items():
+            current[name] += value
+
+
+def child_environ(environ=None):
+    """A copy of ``environ`` (``os.environ`` by default) without the
+    variables turning the timing and memory reports on, for the Python
+    processes the vows start: they would write over the report."""
+    environ = dict(os.environ if environ is None else environ)
+    for name in REPORT_VARIABLES:
+        environ.pop(name, None)
+    return environ
+
+
+@contextlib.contextmanager
+def timed(context, name):
+    """Adds the time spent in the block to the ``name`` timing of
+    ``context``. ``fetch`` and ``wait`` keep every measure."""
+    if not _enabled:
+        yield
+        return
+    start = time.time()
+    try:
+        yield
+    finally:
+        elapsed = time.time() - start
+        timings = get_timings(context)
+        if isinstance(timings[name], list):
+            timings[name].append(elapsed)
+        else:
+            timings[name] += elapsed
+
+
+def increment(context, name):
+    if _enabled:
+        get_timings(context)[name] += 1
+
+
+def _total(timings):
+    return timings['setup'] + timings['teardown'] + sum(timings['wait'])
+
+
+def report():
+    """Returns the timings of every context by path, plus its ``total``: the
+    time spent in ``setup``, ``teardown`` and running the IOLoop."""
+    contexts = {}
+    for path, timings in _timings.items():
+        contexts[path] = dict(timings, total=_total(timings))
+    return {'contexts': contexts}
+
+
+def slowest(count=10):
+    contexts = report()['contexts']
+    paths = sorted(contexts, key=lambda path: contexts[path]['total'],
+                   reverse=True)
+    return [(path, contexts[path]) for path in paths[:count]]
+
+
+def write_report(filename, count=10, file=sys.stderr):
+    data = report()
+    data['slowest'] = [path for path, _ in slowest(count)]
+    with open(filename, 'w') as report_file:
+        json.dump(data, report_file, indent=2, sort_keys=True)
+
+    file.write('\nSlowest %d contexts:\n' % count)
+    for path, timings in slowest(count):
+        file.write('  %8.1fms  %s (%d fetches, %d IOLoop cycles)\n' % (
+            timings['total'] * 1000, path,
+            len(timings['fetch']), timings['ioloop_cycles']
+        ))
+
+
+def enable(filename=None, count=10):
+    """Starts recording; the report is written to ``filename`` (if given)
+    when the process exits."""
+    global _enabled
+    _enabled = True
+    if filename:
+        atexit.register(write_report, filename, count)
+
+
+def disable():
+    """Stops recording; what was recorded is kept."""
+    global _enabled
+    _enabled = False
+
+
+if os.environ.get('TORNADO_PYVOWS_TIMINGS'):
+    enable(
+        os.environ['TORNADO_PYVOWS_TIMINGS'],
+        int(os.environ.get('TORNADO_PYVOWS_SLOWEST', 10))
+    )
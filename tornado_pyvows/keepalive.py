@@ -0,0 +1,46 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import weakref
+
+import pycurl
+from tornado.curl_httpclient import CurlAsyncHTTPClient
+
+
+class KeepAliveHTTPClient(CurlAsyncHTTPClient):
+    """
+    ``CurlAsyncHTTPClient`` that keeps count of how many connections it
+    opened, so vows can see how many requests reused a kept-alive one. As any
+    ``AsyncHTTPClient`` a single instance exists per IOLoop, so every context
+    running on that loop shares its pool of connections.
+    """
+
+    @classmethod
+    def _async_clients(cls):
+        # AsyncHTTPClient looks the dictionary of instances up with hasattr,
+        # which would find the one of CurlAsyncHTTPClient and hand out its
+        # plain instance
+        if '_async_client_dict' not in vars(cls):
+            cls._async_client_dict = weakref.WeakKeyDictionary()
+        return cls._async_client_dict
+
+    def initialize(self, io_loop=None, max_clients=10):
+        super(KeepAliveHTTPClient, self).initialize(io_loop, max_clients)
+        self.stats = {'requests': 0, 'connections': 0, 'reused': 0}
+
+    def _finish(self, curl, curl_error=None, curl_message=None):
+        connections = curl.getinfo(pycurl.NUM_CONNECTS)
+        self.stats['requests'] += 1
+        self.stats['connections'] += connections
+        if not curl_error and not connections:
+            self.stats['reused'] += 1
+        super(KeepAliveHTTPClient, self)._finish(
+            curl, curl_error, curl_message
+        )
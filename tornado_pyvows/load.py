@@ -0,0 +1,152 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import math
+import time
+
+from tornado_pyvows.context import (
+    TornadoHTTPContext,
+    get_max_clients,
+    resize_http_client
+)
+
+
+class LatencyPercentiles(object):
+    """The percentiles of the ``latencies`` (sorted, in seconds) of a
+    result."""
+
+    def percentile(self, percent):
+        """Latency, in milliseconds, under which ``percent`` of the
+        ``latencies`` fall (nearest-rank)."""
+        if not self.latencies:
+            return 0.0
+        rank = int(math.ceil(percent / 100.0 * len(self.latencies)))
+        return self.latencies[max(rank, 1) - 1] * 1000
+
+    @property
+    def p50_ms(self):
+        return self.percentile(50)
+
+    @property
+    def p95_ms(self):
+        return self.percentile(95)
+
+    @property
+    def p99_ms(self):
+        return self.percentile(99)
+
+
+class LoadTestResult(LatencyPercentiles):
+    """Throughput, errors and latency percentiles of a load test."""
+
+    def __init__(self, latencies, errors, elapsed):
+        self.latencies = sorted(latencies)
+        self.requests = len(latencies)
+        self.errors = errors
+        self.elapsed = elapsed
+
+    @property
+    def requests_per_second(self):
+        if not self.elapsed:
+            return 0.0
+        return self.requests / self.elapsed
+
+    def __repr__(self):
+        return ('LoadTestResult(requests=%d, errors=%d, rps=%.1f, '
+                'p50=%.2fms, p95=%.2fms, p99=%.2fms)' % (
+                    self.requests, self.errors, self.requests_per_second,
+                    self.p50_ms, self.p95_ms, self.p99_ms))
+
+
+class LoadTestTornadoHTTPContext(TornadoHTTPContext):
+    """
+    Sends the request returned by ``get_load_request`` over and over,
+    keeping ``load_concurrency`` of them in flight, until ``load_requests``
+    were made or ``load_duration`` seconds went by. The topic is a
+    ``LoadTestResult``.
+    """
+
+    load_concurrency = 10
+    load_requests = None
+    load_duration = None
+
+    def __init__(self, parent, *args, **kwargs):
+        TornadoHTTPContext.__init__(self, parent, *args, **kwargs)
+        super(LoadTestTornadoHTTPContext, self).ignore(
+            'get_load_request', 'run_load'
+        )
+
+    def topic(self):
+        return self.run_load()
+
+    def get_load_request(self):
+        """Returns a ``path`` or a ``(path, kwargs)`` tuple."""
+        return '/'
+
+    def run_load(self):
+        concurrency = self.load_concurrency
+        requests = self.load_requests
+        if requests is None and self.load_duration is None:
+            requests = 100
+        deadline = None
+        if self.load_duration is not None:
+            deadline = time.time() + self.load_duration
+
+        http_client = self.http_client
+        max_clients = get_max_clients(http_client)
+        if max_clients is not None and max_clients < concurrency:
+            http_client = resize_http_client(http_client, concurrency)
+
+        latencies = []
+        state = {'sent': 0, 'in_flight': 0, 'errors': 0}
+
+        def has_more():
+            if requests is not None and state['sent'] >= requests:
+                return False
+            return deadline is None or time.time() < deadline
+
+        def send():
+            request = self.get_load_request()
+            if isinstance(request, tuple):
+                path, options = request
+            else:
+                path, options = request, {}
+            options = self._add_isolation_key(dict(options))
+            state['sent'] += 1
+            state['in_flight'] += 1
+            start = time.time()
+            http_client.fetch(
+                self.get_url(path),
+                lambda response: on_response(start, response),
+                **options
+            )
+
+        def on_response(start, response):
+            latencies.append(time.time() - start)
+            state['in_flight'] -= 1
+            if response.error:
+                state['errors'] += 1
+            if has_more():
+                send()
+            elif not state['in_flight']:
+                self.stop()
+
+        start = time.time()
+        try:
+            while state['in_flight'] < concurrency and has_more():
+                send()
+            if state['in_flight']:
+                # the http client enforces the request timeout
+                self.wait(timeout=None)
+        finally:
+            if http_client is not self.http_client:
+                http_client.close()
+
+        return LoadTestResult(latencies, state['errors'], time.time() - start)
@@ -0,0 +1,219 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+"""
+Opt-in tracking of what the contexts leave behind. Before ``setup`` and
+after ``teardown`` of each context the objects tracked by the garbage
+collector are counted by type, along with the handlers, timeouts and
+callbacks of the context's IOLoop and the open file descriptors; the net
+growth includes the one of the context's descendants.
+
+Set the ``TORNADO_PYVOWS_MEMORY`` environment variable to the file the JSON
+report should be written to; the ``TORNADO_PYVOWS_MEMORY_TOP`` (default 10)
+contexts that grew the most are printed to stderr when the run finishes::
+
+    $ env TORNADO_PYVOWS_MEMORY=memory.json PYTHONPATH=. pyvows vows/
+
+Counting every object is slow, which is why it is off by default.
+"""
+
+import atexit
+import collections
+import gc
+import json
+import os
+import sys
+
+from tornado_pyvows.instrumentation import context_path
+
+_FD_DIRECTORY = '/proc/self/fd'
+
+_snapshots = {}
+_growth = {}
+_enabled = False
+_top = 10
+
+
+def is_enabled():
+    return _enabled
+
+
+def count_objects():
+    """The objects tracked by the garbage collector, by type name."""
+    gc.collect()
+    counts = collections.defaultdict(int)
+    for obj in gc.get_objects():
+        cls = type(obj)
+        counts['%s.%s' % (cls.__module__, cls.__name__)] += 1
+    return counts
+
+
+def open_fds():
+    """What each open file descriptor points to, by number, or None where
+    the system does not tell."""
+    if not os.path.isdir(_FD_DIRECTORY):
+        return None
+    fds = {}
+    for name in os.listdir(_FD_DIRECTORY):
+        try:
+            fds[int(name)] = os.readlink(os.path.join(_FD_DIRECTORY, name))
+        except OSError:
+            # the descriptor of the listing itself, closed by now
+            pass
+    return fds
+
+
+def ioloop_state(io_loop):
+    """The handlers (but the loop's own waker), timeouts and callbacks of
+    ``io_loop``; none at all for a loop that does not exist yet."""
+    if io_loop is None:
+        return {'handlers': 0, 'timeouts': 0, 'callbacks': 0}
+    handlers = len(io_loop._handlers)
+    try:
+        if io_loop._waker.fileno() in io_loop._handlers:
+            handlers -= 1
+    except ValueError:
+        # closed along with the loop
+        pass
+    timeouts = getattr(io_loop, '_virtual_timeouts', io_loop._timeouts)
+    return {
+        'handlers': handlers,
+        'timeouts': len([timeout for timeout in timeouts
+                         if timeout.callback is not None]),
+        'callbacks': len(io_loop._callbacks),
+    }
+
+
+def snapshot(io_loop=None):
+    return {
+        'objects': count_objects(),
+        'fds': open_fds(),
+        'ioloop': ioloop_state(io_loop),
+    }
+
+
+def compare(before, after, top=10):
+    """The net growth between two snapshots: the number of objects, the
+    ``top`` types that grew the most, the file descriptors left open and the
+    change in IOLoop handlers, timeouts and callbacks."""
+    types = {}
+    for name, count in after['objects'].items():
+        growth = count - before['objects'].get(name, 0)
+        if growth:
+            types[name] = growth
+    for name in before['objects']:
+        if name not in after['objects']:
+            types[name] = -before['objects'][name]
+
+    fds = None
+    if before['fds'] is not None and after['fds'] is not None:
+        fds = sorted(target for fd, target in after['fds'].items()
+                     if before['fds'].get(fd) != target)
+
+    top_types = sorted(types.items(), key=lambda item: (-item[1], item[0]))
+    return {
+        'objects': sum(types.values()),
+        'top_types': [list(item) for item in top_types[:top]
+                      if item[1] > 0],
+        'fds': fds,
+        'ioloop': dict((name, after['ioloop'][name] - before['ioloop'][name])
+                       for name in after['ioloop']),
+    }
+
+
+def before_setup(context):
+    if _enabled:
+        io_loop = context.io_loop
+        _snapshots[id(context)] = (io_loop, snapshot(io_loop))
+
+
+def after_teardown(context):
+    if not _enabled:
+        return
+    io_loop, before = _snapshots.pop(id(context), (None, None))
+    if before is None:
+        return
+    if context.io_loop is not io_loop:
+        # a loop of its own, created by its setup
+        before = dict(before, ioloop=ioloop_state(None))
+    _growth[context_path(context)] = compare(
+        before, snapshot(context.io_loop), _top
+    )
+
+
+def pop_growth():
+    """Returns the growth recorded so far and forgets it, for a worker
+    process to send it to the one writing the report."""
+    global _growth
+    growth, _growth = _growth, {}
+    return growth
+
+
+def merge(growth):
+    """Adds the growth returned by ``pop_growth`` in another process."""
+    _growth.update(growth)
+
+
+def report():
+    """Returns the net growth of every context by path."""
+    return {'contexts': dict(_growth)}
+
+
+def largest(count=10):
+    paths = sorted(_growth, key=lambda path: _growth[path]['objects'],
+                   reverse=True)
+    return [(path, _growth[path]) for path in paths[:count]]
+
+
+def write_report(filename, count=10, file=sys.stderr):
+    data = report()
+    data['largest'] = [path for path, _ in largest(count)]
+    with open(filename, 'w') as report_file:
+        json.dump(data, report_file, indent=2, sort_keys=True,
+                  separators=(',', ': '))
+
+    file.write('\nContexts leaving the most objects behind:\n')
+    for path, growth in largest(count):
+        lingering = ', '.join('%d %s' % (value, name) for name, value in
+                              sorted(growth['ioloop'].items()) if value)
+        file.write('  %+8d  %s%s\n' % (
+            growth['objects'], path,
+            lingering and ' (IOLoop: %s)' % lingering
+        ))
+        for name, value in growth['top_types'][:3]:
+            file.write('            %+d %s\n' % (value, name))
+        fds = growth['fds'] or []
+        for target in fds[:3]:
+            file.write('            open: %s\n' % target)
+        if len(fds) > 3:
+            file.write('            and %d more open files\n' % (len(fds) - 3))
+
+
+def enable(filename=None, count=10):
+    """Starts tracking; the report is written to ``filename`` (if given)
+    when the process exits."""
+    global _enabled, _top
+    _enabled = True
+    _top = count
+    if filename:
+        atexit.register(write_report, filename, count)
+
+
+def disable():
+    """Stops tracking; what was recorded is kept."""
+    global _enabled
+    _enabled = False
+
+
+if os.environ.get('TORNADO_PYVOWS_MEMORY'):
+    enable(
+        os.environ['TORNADO_PYVOWS_MEMORY'],
+        int(os.environ.get('TORNADO_PYVOWS_MEMORY_TOP', 10))
+    )
@@ -0,0 +1,165 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import mimetypes
+import os
+import uuid
+
+
+class UploadedFile(object):
+    """
+    A file to upload with ``post(multipart=True)``, read from ``path`` only
+    while the request body is being sent.
+    """
+
+    def __init__(self, path, filename=None, content_type=None):
+        self.path = path
+        self.filename = filename or os.path.basename(path)
+        self.content_type = content_type
+
+
+def is_streamed(value):
+    """Whether a multipart ``value`` has to be read from a file."""
+    if isinstance(value, tuple):
+        value = value[1]
+    return isinstance(value, UploadedFile) or hasattr(value, 'read')
+
+
+class _FilePart(object):
+
+    def __init__(self, source):
+        self.source = source
+        self._file = None
+        if isinstance(source, UploadedFile):
+            self.start = 0
+            self.length = os.path.getsize(source.path)
+        else:
+            self.start = source.tell()
+            source.seek(0, os.SEEK_END)
+            self.length = source.tell() - self.start
+            source.seek(self.start)
+
+    def chunks(self, chunk_size):
+        if isinstance(self.source, UploadedFile):
+            self._file = open(self.source.path, 'rb')
+            source = self._file
+        else:
+            source = self.source
+            source.seek(self.start)
+        try:
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class MultipartEncoder(object):
+    """
+    Encodes ``fields`` as "multipart/form-data" without holding the files in
+    memory: ``read`` (or ``chunks``) produce the body ``chunk_size`` bytes at
+    a time and ``length`` is known upfront.
+
+    Values are either strings, ``(filename, content)`` tuples (optionally
+    with a content type as third element) whose content is a string or a
+    file-like object, ``UploadedFile`` instances or file-like objects.
+    """
+
+    def __init__(self, fields, boundary=None, chunk_size=64 * 1024):
+        self.boundary = boundary or uuid.uuid4().hex
+        self.content_type = 'multipart/form-data; boundary=%s' % self.boundary
+        self.chunk_size = chunk_size
+        self._parts = []
+        for name, value in sorted(fields.items()):
+            self._add_field(name, value)
+        self._parts.append('--%s--\r\n' % self.boundary)
+        self.length = sum(
+            part.length if isinstance(part, _FilePart) else len(part)
+            for part in self._parts
+        )
+        self.rewind()
+
+    def _add_field(self, name, value):
+        filename = content_type = None
+        if isinstance(value, tuple):
+            if len(value) > 2:
+                content_type = value[2]
+            filename, value = value[:2]
+        elif isinstance(value, UploadedFile):
+            filename = value.filename
+            content_type = value.content_type
+        elif hasattr(value, 'read'):
+            filename = os.path.basename(getattr(value, 'name', name))
+
+        header = '--%s\r\nContent-Disposition: form-data; name="%s"' % (
+            self.boundary, name
+        )
+        if filename is not None:
+            content_type = (content_type or
+                            mimetypes.guess_type(filename)[0] or
+                            'application/octet-stream')
+            header += '; filename="%s"\r\nContent-Type: %s' % (
+                filename, content_type
+            )
+        self._parts.append(header + '\r\n\r\n')
+
+        if isinstance(value, UploadedFile) or hasattr(value, 'read'):
+            self._parts.append(_FilePart(value))
+        else:
+            if isinstance(value, unicode):
+                value = value.encode('utf-8')
+            self._parts.append(str(value))
+        self._parts.append('\r\n')
+
+    def chunks(self):
+        for part in self._parts:
+            if isinstance(part, _FilePart):
+                for chunk in part.chunks(self.chunk_size):
+                    yield chunk
+            else:
+                yield part
+
+    def rewind(self):
+        """Starts the body over, e.g. when curl has to send it again."""
+        self._chunks = self.chunks()
+        self._buffer = ''
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def prepare_curl_upload(encoder):
+    """
+    Returns a ``prepare_curl_callback`` making a curl based client read the
+    body of a POST from ``encoder`` while sending it.
+    """
+    import pycurl
+
+    def prepare(curl):
+        def ioctl(cmd):
+            if cmd == curl.IOCMD_RESTARTREAD:
+                encoder.rewind()
+        encoder.rewind()
+        curl.setopt(pycurl.READFUNCTION, encoder.read)
+        curl.setopt(pycurl.IOCTLFUNCTION, ioctl)
+        curl.setopt(pycurl.POSTFIELDSIZE_LARGE, encoder.length)
+    return prepare
@@ -0,0 +1,205 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+"""
+Runs the top-level vows batches on a pool of worker processes, each one with
+its own private ``IOLoop``, HTTP client and server ports, and reports the
+merged results through the regular PyVows reporter::
+
+    $ env PYTHONPATH=. python -m tornado_pyvows.parallel --workers 4 vows/
+
+The workers are forked from the process that collected the vows and find
+the batches in the copy of ``Vows.suites`` they inherit, so the runner needs
+``os.fork`` (it is not available on Windows).
+"""
+
+import multiprocessing
+import optparse
+import os
+import sys
+import time
+import traceback
+
+import tornado.ioloop
+import tornado.testing
+from pyvows import Vows
+from pyvows.result import VowsResult
+
+from tornado_pyvows import instrumentation
+from tornado_pyvows import memory
+
+#: The contexts let the kernel pick their ports. Ports handed out by
+#: ``tornado.testing.get_unused_port``, for vows still calling it, start at
+#: ``10000 + index * PORTS_PER_WORKER`` in each worker so that workers
+#: never collide.
+PORTS_PER_WORKER = 1000
+
+_suites = None
+
+
+class RemoteError(Exception):
+    """An error raised in a worker process, carrying its formatted
+    traceback."""
+
+
+class _RemoteContextError(object):
+    def __init__(self, source, exc_info):
+        self.source = source
+        self.exc_info = exc_info
+
+
+class _RemoteContextInstance(object):
+    def __init__(self, generated_topic):
+        self.generated_topic = generated_topic
+
+
+def _remote_exc_info(exc_info):
+    message = ''.join(traceback.format_exception(*exc_info))
+    return (RemoteError, RemoteError(message), None)
+
+
+def _skip_reason(skip):
+    return skip and str(skip) or None
+
+
+def _serialize_test(test):
+    test = dict(test)
+    test['context_instance'] = _RemoteContextInstance(
+        test['context_instance'].generated_topic
+    )
+    test['topic'] = repr(test['topic'])
+    test['result'] = None
+    test['skip'] = _skip_reason(test['skip'])
+    if test['error']:
+        error = test['error']
+        err_type, err_value, err_traceback = _remote_exc_info(
+            (error['type'], error['value'], error['traceback'])
+        )
+        test['error'] = {
+            'type': err_type,
+            'value': err_value,
+            'traceback': err_traceback
+        }
+    return test
+
+
+def _serialize_context(context):
+    context = dict(context)
+    context['tests'] = [_serialize_test(test) for test in context['tests']]
+    context['contexts'] = [
+        _serialize_context(child) for child in context['contexts']
+    ]
+    context['skip'] = _skip_reason(context['skip'])
+    if context['error']:
+        error = context['error']
+        exc_info = getattr(error, 'exc_info', None) or (
+            type(error), error, None
+        )
+        context['error'] = _RemoteContextError(
+            getattr(error, 'source', 'teardown'),
+            _remote_exc_info(exc_info)
+        )
+    return context
+
+
+def _init_worker(counter):
+    global _suites
+    # only filled in when forked from the process that collected the vows
+    _suites = dict(Vows.suites)
+
+    with counter.get_lock():
+        index = counter.value
+        counter.value += 1
+
+    # the forked IOLoop singleton and its AsyncHTTPClient belong to the
+    # parent; give this worker a loop of its own (and its own range of
+    # guessed ports)
+    if tornado.ioloop.IOLoop.initialized():
+        del tornado.ioloop.IOLoop._instance
+    tornado.testing._next_port = 10000 + index * PORTS_PER_WORKER
+
+
+def _run_batch(batch):
+    suite, name = batch
+    Vows.suites = {
+        suite: set(ctx for ctx in _suites[suite] if ctx.__name__ == name)
+    }
+    result = Vows.run(None, None)
+    # the reports are written by the parent process, which runs no context
+    return (
+        [_serialize_context(context) for context in result.contexts],
+        instrumentation.pop_timings(),
+        memory.pop_growth(),
+    )
+
+
+def collect_batches(path, pattern):
+    """Imports the vows under ``path`` and returns the ``(suite, name)`` of
+    every top-level batch found."""
+    Vows.collect(path, pattern)
+    batches = []
+    for suite, contexts in sorted(Vows.suites.items()):
+        for context in sorted(contexts, key=lambda ctx: ctx.__name__):
+            batches.append((suite, context.__name__))
+    return batches
+
+
+def run(path, pattern='*_vows.py', workers=None):
+    """Runs every batch found under ``path`` on ``workers`` processes
+    (defaults to the number of CPUs) and returns a ``VowsResult``."""
+    if not hasattr(os, 'fork'):
+        raise RuntimeError(
+            'tornado_pyvows.parallel forks its workers, which this platform '
+            'does not support'
+        )
+    start = time.time()
+    batches = collect_batches(path, pattern)
+
+    pool = multiprocessing.Pool(
+        workers or multiprocessing.cpu_count(),
+        initializer=_init_worker,
+        initargs=(multiprocessing.Value('i', 0),)
+    )
+    result = VowsResult()
+    try:
+        for contexts, timings, growth in pool.imap(_run_batch, batches):
+            result.contexts.extend(contexts)
+            instrumentation.merge(timings)
+            memory.merge(growth)
+    finally:
+        pool.close()
+        pool.join()
+
+    result.elapsed_time = time.time() - start
+    return result
+
+
+def main():
+    from pyvows.reporting import VowsDefaultReporter
+
+    parser = optparse.OptionParser(
+        usage='%prog [options] [path]',
+        description='Runs tornado_pyvows batches on several processes.'
+    )
+    parser.add_option('-p', '--pattern', default='*_vows.py')
+    parser.add_option('-w', '--workers', type='int', default=None)
+    parser.add_option('-v', action='count', dest='verbosity')
+    options, args = parser.parse_args()
+    if len(args) > 1:
+        parser.error('expected a single path')
+
+    result = run(args and args[0] or os.curdir, options.pattern,
+                 options.workers)
+    VowsDefaultReporter(result, options.verbosity or 2).pretty_print()
+    sys.exit(result.errored_tests)
+
+
+if __name__ == '__main__':
+    main()
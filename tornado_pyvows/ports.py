@@ -0,0 +1,24 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import socket
+
+from tornado.netutil import bind_sockets
+
+
+def bind_unused_port(address='0.0.0.0'):
+    """
+    Binds a listening socket to a port the kernel picks, returning it with
+    the port. Unlike guessing a port with ``get_unused_port`` and listening
+    on it afterwards, this cannot collide with another server starting at
+    the same time, be it in another process.
+    """
+    [sock] = bind_sockets(0, address, family=socket.AF_INET)
+    return sock, sock.getsockname()[1]
@@ -0,0 +1,175 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+"""
+Profiling of the requests sent by ``fetch``: the handlers run in the same
+process, on the IOLoop that ``wait`` starts, so profiling the wait profiles
+them.
+
+``SamplingProfiler`` records the stack every ``interval`` seconds of CPU
+time (``SIGPROF``, so only on Unix and from the main thread), which costs
+next to nothing between samples. ``DeterministicProfiler`` runs ``cProfile``
+for the full ``pstats`` picture.
+"""
+
+import collections
+import contextlib
+import os
+import signal
+
+import tornado.ioloop
+
+_IOLOOP_FILENAME = os.path.splitext(tornado.ioloop.__file__)[0]
+
+
+def _label(frame):
+    filename, line, name = frame
+    return '%s (%s:%d)' % (name, os.path.basename(filename), line)
+
+
+def _trim(stack):
+    """Drops the frames up to the IOLoop, the same for every sample."""
+    for index in range(len(stack) - 1, -1, -1):
+        filename, _, name = stack[index]
+        if (name == 'start' and
+                os.path.splitext(filename)[0] == _IOLOOP_FILENAME):
+            return stack[index + 1:]
+    return stack
+
+
+class SampledProfile(object):
+    """The stacks sampled by a ``SamplingProfiler``, as ``(filename, line,
+    function)`` frames from the IOLoop down, with how many times each was
+    seen."""
+
+    def __init__(self, samples, interval):
+        self.interval = interval
+        self.samples = collections.defaultdict(int)
+        for stack, count in samples.items():
+            stack = _trim(stack)
+            if stack:
+                self.samples[stack] += count
+
+    @property
+    def total(self):
+        return sum(self.samples.values())
+
+    def collapsed(self):
+        """The samples in the collapsed stack format read by
+        ``flamegraph.pl`` and speedscope, one ``a;b;c count`` per line."""
+        lines = ['%s %d' % (';'.join(_label(frame) for frame in stack), count)
+                 for stack, count in self.samples.items()]
+        return '\n'.join(sorted(lines))
+
+    def functions(self):
+        """``{frame: (self samples, total samples)}``; a function counts
+        once per sample however deep it recurses."""
+        functions = collections.defaultdict(lambda: [0, 0])
+        for stack, count in self.samples.items():
+            functions[stack[-1]][0] += count
+            for frame in set(stack):
+                functions[frame][1] += count
+        return dict((frame, tuple(counts))
+                    for frame, counts in functions.items())
+
+    def top(self, count=20, sort='self'):
+        """The ``count`` functions seen the most, as ``(label, self
+        samples, total samples)``, sorted by ``'self'`` or ``'total'``."""
+        index = 0 if sort == 'self' else 1
+        functions = sorted(self.functions().items(),
+                           key=lambda item: (-item[1][index], item[0]))
+        return [(_label(frame), counts[0], counts[1])
+                for frame, counts in functions[:count]]
+
+    def __str__(self):
+        lines = ['%d samples, one every %gms of CPU time' % (
+            self.total, self.interval * 1000)]
+        lines.append('%8s %8s  function' % ('self', 'total'))
+        for label, own, total in self.top():
+            lines.append('%8d %8d  %s' % (own, total, label))
+        return '\n'.join(lines)
+
+
+class SamplingProfiler(object):
+
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self._samples = collections.defaultdict(int)
+        self._previous_handler = None
+
+    def _sample(self, signum, frame):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append((code.co_filename, code.co_firstlineno,
+                          code.co_name))
+            frame = frame.f_back
+        stack.reverse()
+        self._samples[tuple(stack)] += 1
+
+    def start(self):
+        self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+        # restarts the system calls the samples interrupt instead of
+        # failing them with EINTR
+        signal.siginterrupt(signal.SIGPROF, False)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self):
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, self._previous_handler or
+                      signal.SIG_DFL)
+
+    def result(self):
+        return SampledProfile(self._samples, self.interval)
+
+
+class DeterministicProfiler(object):
+
+    def __init__(self):
+        import cProfile
+        self._profile = cProfile.Profile()
+
+    def start(self):
+        self._profile.enable()
+
+    def stop(self):
+        self._profile.disable()
+
+    def result(self):
+        """A ``pstats.Stats``, printing to a ``StringIO`` kept as its
+        ``stream``."""
+        import pstats
+        import StringIO
+        return pstats.Stats(self._profile, stream=StringIO.StringIO())
+
+
+def get_profiler(profile):
+    """The profiler for the ``profile`` option of ``fetch``: None when it is
+    false, ``'cprofile'`` for a ``DeterministicProfiler``, a float for the
+    sampling interval in seconds or anything else for the default one."""
+    if not profile:
+        return None
+    if profile == 'cprofile':
+        return DeterministicProfiler()
+    if isinstance(profile, float):
+        return SamplingProfiler(profile)
+    return SamplingProfiler()
+
+
+@contextlib.contextmanager
+def profiled(profiler):
+    if profiler is None:
+        yield
+        return
+    profiler.start()
+    try:
+        yield
+    finally:
+        profiler.stop()
@@ -0,0 +1,115 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import json
+import re
+
+from tornado.httpclient import HTTPResponse
+
+_PATH_TOKEN = re.compile(r'\[(-?\d+)\]|([^.\[\]]+)')
+
+_missing = object()
+
+
+class cached_property(object):
+    """Computes the value once per instance, then stores it in place of the
+    property."""
+
+    def __init__(self, func):
+        self.func = func
+        self.__name__ = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = instance.__dict__[self.__name__] = self.func(instance)
+        return value
+
+
+def parse_path(path):
+    """Splits ``'items[0].name'`` (or ``'$.items.0.name'``) into ``['items',
+    0, 'name']``."""
+    if path.startswith('$'):
+        path = path[1:]
+    keys = []
+    for index, key in _PATH_TOKEN.findall(path):
+        if index:
+            keys.append(int(index))
+        elif key.lstrip('-').isdigit():
+            keys.append(int(key))
+        else:
+            keys.append(key)
+    return keys
+
+
+class Response(HTTPResponse):
+    """
+    The ``HTTPResponse`` returned by ``fetch``, with views of it computed
+    the first time they are read and kept: ``text``, ``json``,
+    ``content_type`` and ``charset``. However many vows check the body of a
+    topic, it is decoded and parsed once.
+    """
+
+    @classmethod
+    def wrap(cls, response):
+        if isinstance(response, cls) or not isinstance(response,
+                                                       HTTPResponse):
+            return response
+        wrapped = cls.__new__(cls)
+        wrapped.__dict__.update(response.__dict__)
+        return wrapped
+
+    @cached_property
+    def content_type(self):
+        """The media type of the ``Content-Type`` header, lower-cased and
+        without its parameters, or None."""
+        value = self.headers.get('Content-Type')
+        if not value:
+            return None
+        return value.split(';', 1)[0].strip().lower()
+
+    @cached_property
+    def charset(self):
+        """The ``charset`` parameter of the ``Content-Type`` header, utf-8
+        when there is none."""
+        for parameter in (self.headers.get('Content-Type') or '').split(';'):
+            name, _, value = parameter.partition('=')
+            if name.strip().lower() == 'charset' and value.strip():
+                return value.strip().strip('"')
+        return 'utf-8'
+
+    @cached_property
+    def text(self):
+        """The body decoded with ``charset``."""
+        return (self.body or '').decode(self.charset, 'replace')
+
+    @cached_property
+    def json(self):
+        """The body parsed as JSON; raises ``ValueError`` when it is not."""
+        return json.loads(self.text)
+
+    def json_path(self, path, default=_missing):
+        """
+        The value at ``path`` in ``json``: keys separated by dots and list
+        indexes in brackets, e.g. ``'upload.files[0].name'``. Raises
+        ``KeyError`` when there is nothing there and no ``default``.
+        """
+        value = self.json
+        for key in parse_path(path):
+            try:
+                if isinstance(value, list) != isinstance(key, int):
+                    raise KeyError(key)
+                value = value[key]
+            except (KeyError, IndexError, TypeError):
+                if default is not _missing:
+                    return default
+                raise KeyError(path)
+        return value
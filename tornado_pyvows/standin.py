@@ -0,0 +1,232 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+"""
+A local stand-in for the external HTTP services a client talks to. It
+replays the responses recorded in a cassette, a JSON file like::
+
+    {"interactions": [
+        {"request": {"method": "GET", "uri": "/api/v1/bins/1"},
+         "response": {"code": 200,
+                      "headers": [["Content-Type", "application/json"]],
+                      "body": "{\\"name\\": \\"1\\"}",
+                      "latency": 0.12}}
+    ]}
+
+Requests are matched by method and uri (path and query string); when the
+same request was recorded several times the recordings are replayed in
+order, the last one being repeated. With a ``target`` URL the requests
+that were not recorded yet are sent to the real service and recorded,
+along with the time it took to answer them.
+"""
+
+import base64
+import json
+import os
+import time
+
+from tornado.httpclient import AsyncHTTPClient
+from tornado.httpserver import HTTPServer
+from tornado.web import Application, RequestHandler, asynchronous
+
+from tornado_pyvows.ports import bind_unused_port
+
+# headers describing how the recorded response was transferred, which do
+# not apply to the replayed one
+_TRANSFER_HEADERS = frozenset([
+    'connection', 'content-encoding', 'content-length', 'transfer-encoding'
+])
+
+
+def _encode_body(body):
+    if not body:
+        return {'body': ''}
+    try:
+        return {'body': body.decode('utf-8')}
+    except UnicodeDecodeError:
+        return {'body': base64.b64encode(body), 'encoding': 'base64'}
+
+
+def _decode_body(data):
+    body = data.get('body') or ''
+    if data.get('encoding') == 'base64':
+        return base64.b64decode(body)
+    return body.encode('utf-8')
+
+
+class Cassette(object):
+    """The interactions recorded for a stand-in, optionally kept in
+    ``filename``."""
+
+    def __init__(self, interactions=None, filename=None):
+        self.interactions = list(interactions or [])
+        self.filename = filename
+        self.modified = False
+        self._played = {}
+
+    @classmethod
+    def load(cls, filename):
+        """Loads ``filename``, or starts an empty cassette to record into
+        it when it does not exist yet."""
+        if not os.path.exists(filename):
+            return cls(filename=filename)
+        with open(filename) as cassette_file:
+            data = json.load(cassette_file)
+        return cls(data.get('interactions'), filename)
+
+    def save(self, filename=None):
+        with open(filename or self.filename, 'w') as cassette_file:
+            json.dump({'interactions': self.interactions}, cassette_file,
+                      indent=2, sort_keys=True)
+        self.modified = False
+
+    def _matching(self, method, uri):
+        return [interaction for interaction in self.interactions
+                if interaction['request']['method'] == method and
+                interaction['request']['uri'] == uri]
+
+    def play(self, method, uri):
+        """Returns the recorded response to replay, or None."""
+        matching = self._matching(method, uri)
+        if not matching:
+            return None
+        key = (method, uri)
+        index = min(self._played.get(key, 0), len(matching) - 1)
+        self._played[key] = index + 1
+        return matching[index]['response']
+
+    def record(self, method, uri, body, response, latency):
+        request = dict(method=method, uri=uri)
+        if body:
+            request.update(_encode_body(body))
+        recorded = dict(
+            code=response.code,
+            headers=[[name, value] for name, value in
+                     response.headers.get_all()
+                     if name.lower() not in _TRANSFER_HEADERS],
+            latency=round(latency, 4)
+        )
+        recorded.update(_encode_body(response.body))
+        self.interactions.append(dict(request=request, response=recorded))
+        self._played[(method, uri)] = len(self._matching(method, uri))
+        self.modified = True
+
+
+class StandInHandler(RequestHandler):
+    SUPPORTED_METHODS = ('GET', 'HEAD', 'POST', 'DELETE', 'PATCH', 'PUT',
+                         'OPTIONS')
+
+    def initialize(self, stand_in):
+        self.stand_in = stand_in
+
+    @asynchronous
+    def replay(self, *args):
+        method, uri = self.request.method, self.request.uri
+        response = self.stand_in.cassette.play(method, uri)
+        if response is not None:
+            self.stand_in.delay(response, lambda: self.respond(response))
+        elif self.stand_in.target:
+            self.stand_in.forward(self.request, self.on_forwarded)
+        else:
+            self.set_status(404)
+            self.finish('No response recorded for %s %s' % (method, uri))
+
+    get = head = post = delete = patch = put = options = replay
+
+    def on_forwarded(self, response, latency):
+        if response.code == 599:
+            # no answer from the service, nothing worth recording
+            self.set_status(502)
+            self.finish(str(response.error))
+            return
+        self.stand_in.cassette.record(
+            self.request.method, self.request.uri, self.request.body,
+            response, latency
+        )
+        self.respond(self.stand_in.cassette.play(
+            self.request.method, self.request.uri
+        ))
+
+    def respond(self, response):
+        self.set_status(response['code'])
+        self.clear_header('Content-Type')
+        for name, value in response['headers']:
+            self.add_header(name, value)
+        self.finish(_decode_body(response))
+
+
+class StandIn(object):
+    """
+    Serves the responses of ``cassette`` (a ``Cassette`` or the filename of
+    one) on a local port; ``url`` is its base URL.
+
+    :param latency:
+        Seconds to wait before each response, overriding the latency that
+        was recorded.
+    :param target:
+        Base URL of the real service, to record the requests the cassette
+        has no response for.
+    """
+
+    def __init__(self, cassette, io_loop, latency=None, target=None):
+        if not isinstance(cassette, Cassette):
+            cassette = Cassette.load(cassette)
+        self.cassette = cassette
+        self.io_loop = io_loop
+        self.latency = latency
+        self.target = target and target.rstrip('/')
+        self.port = None
+        self.http_server = None
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:%s' % self.port
+
+    def get_url(self, path):
+        return self.url + path
+
+    def start(self):
+        application = Application([
+            (r'.*', StandInHandler, dict(stand_in=self)),
+        ])
+        sock, self.port = bind_unused_port('127.0.0.1')
+        self.http_server = HTTPServer(application, io_loop=self.io_loop)
+        self.http_server.add_sockets([sock])
+        return self
+
+    def stop(self):
+        if self.http_server is not None:
+            self.http_server.stop()
+            self.http_server = None
+        if self.cassette.modified and self.cassette.filename:
+            self.cassette.save()
+
+    def delay(self, response, callback):
+        latency = self.latency
+        if latency is None:
+            latency = response.get('latency') or 0
+        if latency:
+            self.io_loop.add_timeout(time.time() + latency, callback)
+        else:
+            callback()
+
+    def forward(self, request, callback):
+        headers = dict((name, value) for name, value in
+                       request.headers.get_all() if name.lower() != 'host')
+        body = request.body
+        if not body and request.method not in ('POST', 'PUT', 'PATCH'):
+            body = None
+        start = time.time()
+        AsyncHTTPClient(io_loop=self.io_loop).fetch(
+            self.target + request.uri,
+            lambda response: callback(response, time.time() - start),
+            method=request.method, headers=headers, body=body,
+            follow_redirects=False, allow_nonstandard_methods=True
+        )
@@ -0,0 +1,89 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import collections
+import hashlib
+
+from tornado_pyvows.response import Response
+
+
+class ResponseStream(object):
+    """
+    Iterates over the body chunks of a response as they arrive, running the
+    IOLoop of ``context`` whenever it needs more. Once the iteration is over
+    ``response`` holds the (body-less) ``Response``.
+    """
+
+    def __init__(self, context, url, **kwargs):
+        self.context = context
+        self.response = None
+        self._chunks = collections.deque()
+        context.http_client.fetch(
+            url, self._on_response, streaming_callback=self._on_chunk,
+            **kwargs
+        )
+
+    def _on_chunk(self, chunk):
+        self._chunks.append(chunk)
+        self.context.stop()
+
+    def _on_response(self, response):
+        self.response = Response.wrap(response)
+        self.context.stop()
+
+    def __iter__(self):
+        while True:
+            while self._chunks:
+                yield self._chunks.popleft()
+            if self.response is not None:
+                break
+            # the http client enforces the request timeout
+            self.context.wait(timeout=None)
+
+    def digest(self, algorithm='md5', contains=()):
+        """Consumes the stream into a ``StreamDigest``."""
+        digest = StreamDigest(algorithm, contains)
+        for chunk in self:
+            digest.update(chunk)
+        digest.response = self.response
+        return digest
+
+
+class StreamDigest(object):
+    """
+    Keeps only what is needed to verify a body fed chunk by chunk: its
+    ``size``, its ``hexdigest`` and which of the ``contains`` strings were
+    found (even across chunk boundaries).
+    """
+
+    def __init__(self, algorithm='md5', contains=()):
+        self.size = 0
+        self.response = None
+        self._hash = hashlib.new(algorithm)
+        self._found = dict((pattern, False) for pattern in contains)
+        self._overlap = max([len(pattern) for pattern in contains] or [1]) - 1
+        self._tail = ''
+
+    def update(self, chunk):
+        self.size += len(chunk)
+        self._hash.update(chunk)
+        if self._found:
+            window = self._tail + chunk
+            for pattern, found in self._found.items():
+                if not found and pattern in window:
+                    self._found[pattern] = True
+            self._tail = window[-self._overlap:] if self._overlap else ''
+
+    @property
+    def hexdigest(self):
+        return self._hash.hexdigest()
+
+    def contains(self, pattern):
+        return self._found[pattern]
@@ -0,0 +1,139 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+"""
+Topics that do not block on the IOLoop themselves. A topic of a
+``TornadoContext`` may either return a ``Future`` or be a generator yielding
+``tornado.gen`` objects (``gen.Task``, lists of them to run them at the same
+time, or Futures where supported)::
+
+    def topic(self):
+        home, about = yield [
+            self.async_fetch('/'),
+            self.async_fetch('/about')
+        ]
+        raise Return((home.body, about.body))
+
+The context runs its IOLoop until the topic is done and its value, given
+through ``Return``, becomes the topic of the vows.
+"""
+
+import functools
+import inspect
+import sys
+
+from tornado import gen
+
+try:
+    from tornado.concurrent import Future as _TornadoFuture
+except ImportError:
+    _TornadoFuture = None
+
+try:
+    from concurrent.futures import Future as _ThreadFuture
+except ImportError:
+    _ThreadFuture = None
+
+FUTURE_TYPES = tuple(
+    future for future in (_TornadoFuture, _ThreadFuture) if future is not None
+)
+
+if hasattr(gen, 'Return'):
+    Return = gen.Return
+else:
+    class Return(Exception):
+        """Raised by a generator topic to give its value."""
+
+        def __init__(self, value=None):
+            Exception.__init__(self)
+            self.value = value
+
+
+def is_future(value):
+    return bool(FUTURE_TYPES) and isinstance(value, FUTURE_TYPES)
+
+
+def is_yieldable(value):
+    """Whether ``value`` is something ``tornado.gen`` can wait on."""
+    if isinstance(value, list):
+        return bool(value) and all(is_yieldable(item) for item in value)
+    return isinstance(value, gen.YieldPoint) or is_future(value)
+
+
+def wait_for_future(context, future, timeout):
+    if not future.done():
+        future.add_done_callback(
+            lambda _: context.io_loop.add_callback(context.stop)
+        )
+        context.wait(timeout=timeout)
+    return future.result()
+
+
+def wait_for_generator(context, generator, first, timeout):
+    """Runs ``generator``, whose first yielded value was ``first``, as a
+    ``gen.engine`` function on the IOLoop of ``context``."""
+
+    def fail():
+        context.failure = sys.exc_info()
+        context.stop()
+
+    @gen.engine
+    def run(callback):
+        yielded = first
+        while True:
+            try:
+                result = yield yielded
+            except Exception:
+                step = functools.partial(generator.throw, *sys.exc_info())
+            else:
+                step = functools.partial(generator.send, result)
+            try:
+                yielded = step()
+            except StopIteration:
+                callback(None)
+                return
+            except Return as error:
+                callback(error.value)
+                return
+            except Exception:
+                fail()
+                return
+
+    run(context.stop)
+    return context.wait(timeout=timeout)
+
+
+def resolve(context, topic, timeout):
+    """
+    Returns the value of the ``topic`` just computed for ``context``,
+    running its IOLoop first if the topic is a Future or a generator
+    yielding ``tornado.gen`` objects. Other generators are left alone as
+    pyVows enumerates them into one topic per value.
+    """
+    if is_future(topic):
+        return wait_for_future(context, topic, timeout)
+    if not inspect.isgenerator(topic):
+        return topic
+
+    try:
+        first = next(topic)
+    except StopIteration:
+        return (value for value in ())
+    except Return as error:
+        return error.value
+
+    if is_yieldable(first):
+        return wait_for_generator(context, topic, first, timeout)
+
+    def replay():
+        yield first
+        for value in topic:
+            yield value
+    return replay()
@@ -0,0 +1,155 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import copy
+import functools
+import time
+import urlparse
+from cStringIO import StringIO
+
+from tornado import httputil
+from tornado.httpclient import HTTPRequest, HTTPResponse
+from tornado.httpserver import HTTPRequest as ServerHTTPRequest
+
+
+class InProcessConnection(object):
+    """
+    Stands in for the ``HTTPConnection`` of an ``HTTPServer``: parses what
+    the handler writes, handing the status line and headers to the
+    ``header_callback`` of the client ``request`` and each piece of the body
+    to its ``streaming_callback`` (or buffering it), and calls ``callback``
+    with the head and the buffered body when the request is finished.
+    """
+    xheaders = False
+
+    def __init__(self, io_loop, request, callback):
+        self.io_loop = io_loop
+        self.request = request
+        self.callback = callback
+        self.stream = self
+        self.head = None
+        self.body = StringIO()
+        self._data = ''
+
+    def set_close_callback(self, callback):
+        pass
+
+    def write(self, chunk, callback=None):
+        self.io_loop.add_callback(functools.partial(self._on_data, chunk))
+        if callback is not None:
+            self.io_loop.add_callback(callback)
+
+    def _on_data(self, chunk):
+        if self.head is None:
+            self._data += chunk
+            if '\r\n\r\n' not in self._data:
+                return
+            self.head, _, chunk = self._data.partition('\r\n\r\n')
+            self._data = ''
+            if self.request.header_callback is not None:
+                for line in self.head.split('\r\n'):
+                    self.request.header_callback(line + '\r\n')
+                self.request.header_callback('\r\n')
+        if chunk:
+            if self.request.streaming_callback is not None:
+                self.request.streaming_callback(chunk)
+            else:
+                self.body.write(chunk)
+
+    def finish(self):
+        self.io_loop.add_callback(
+            lambda: self.callback(self.head, self.body.getvalue())
+        )
+
+
+class InProcessHTTPClient(object):
+    """
+    Replacement for ``AsyncHTTPClient`` that hands every request straight to
+    ``app`` instead of sending it through a socket. The host and port of the
+    requested url are ignored.
+    """
+
+    def __init__(self, app, io_loop):
+        self.app = app
+        self.io_loop = io_loop
+
+    def fetch(self, request, callback, **kwargs):
+        if not isinstance(request, HTTPRequest):
+            request = HTTPRequest(url=request, **kwargs)
+        self._fetch(request, callback, request.url, time.time())
+
+    def _fetch(self, request, callback, url, start_time):
+        scheme, netloc, path, query, _ = urlparse.urlsplit(url)
+        uri = path or '/'
+        if query:
+            uri += '?' + query
+
+        headers = httputil.HTTPHeaders(request.headers)
+        headers.setdefault('Host', netloc)
+        body = request.body or ''
+        if body:
+            headers['Content-Length'] = str(len(body))
+        if request.method == 'POST':
+            # as done by SimpleAsyncHTTPClient
+            headers.setdefault(
+                'Content-Type', 'application/x-www-form-urlencoded'
+            )
+
+        def on_finish(head, body):
+            response = self._parse_response(
+                request, url, head, body, time.time() - start_time
+            )
+            redirect = self._get_redirect(request, response)
+            if redirect is not None:
+                self._fetch(redirect, callback, redirect.url, start_time)
+            else:
+                callback(response)
+
+        connection = InProcessConnection(self.io_loop, request, on_finish)
+        server_request = ServerHTTPRequest(
+            request.method, uri, version='HTTP/1.0', headers=headers,
+            body=body, remote_ip='127.0.0.1', protocol=scheme or 'http',
+            host=netloc, connection=connection
+        )
+        if request.method in ('POST', 'PATCH', 'PUT'):
+            httputil.parse_body_arguments(
+                headers.get('Content-Type', ''), body,
+                server_request.arguments, server_request.files
+            )
+        self.app(server_request)
+
+    def _parse_response(self, request, url, head, body, request_time):
+        status_line, _, header_lines = head.partition('\r\n')
+        code = int(status_line.split(' ', 2)[1])
+        return HTTPResponse(
+            request, code,
+            headers=httputil.HTTPHeaders.parse(header_lines),
+            buffer=StringIO(body),
+            effective_url=url,
+            request_time=request_time
+        )
+
+    def _get_redirect(self, request, response):
+        if not (request.follow_redirects and request.max_redirects > 0 and
+                response.code in (301, 302, 303, 307) and
+                'Location' in response.headers):
+            return None
+        redirect = copy.copy(request)
+        redirect.url = urlparse.urljoin(
+            response.effective_url, response.headers['Location']
+        )
+        redirect.max_redirects = request.max_redirects - 1
+        if response.code in (302, 303):
+            redirect.method = 'GET'
+            redirect.body = None
+        return redirect
+
+    def close(self):
+        pass
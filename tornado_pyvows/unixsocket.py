@@ -0,0 +1,52 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import copy
+import urlparse
+
+import pycurl
+from tornado.curl_httpclient import CurlAsyncHTTPClient
+from tornado.httpclient import AsyncHTTPClient, HTTPRequest
+
+
+def is_local_url(url):
+    """Whether ``url`` is one ``get_url`` builds for a server without a
+    port, i.e. one listening on a Unix domain socket."""
+    parsed = urlparse.urlsplit(url)
+    return parsed.hostname == 'localhost' and parsed.port is None
+
+
+class UnixSocketHTTPClient(CurlAsyncHTTPClient):
+    """
+    ``CurlAsyncHTTPClient`` sending the requests to ``http://localhost/...``
+    through the Unix domain socket at ``socket_path``. Requests to any other
+    URL are handed to the regular ``AsyncHTTPClient`` of the IOLoop.
+    """
+
+    def initialize(self, io_loop=None, max_clients=10, socket_path=None):
+        super(UnixSocketHTTPClient, self).initialize(io_loop, max_clients)
+        self.socket_path = socket_path
+
+    def fetch(self, request, callback, **kwargs):
+        if not isinstance(request, HTTPRequest):
+            request = HTTPRequest(url=request, **kwargs)
+        if not is_local_url(request.url):
+            AsyncHTTPClient(io_loop=self.io_loop).fetch(request, callback)
+            return
+
+        request = copy.copy(request)
+        prepare_curl_callback = request.prepare_curl_callback
+
+        def prepare(curl):
+            curl.setopt(pycurl.UNIX_SOCKET_PATH, self.socket_path)
+            if prepare_curl_callback is not None:
+                prepare_curl_callback(curl)
+        request.prepare_curl_callback = prepare
+        super(UnixSocketHTTPClient, self).fetch(request, callback)
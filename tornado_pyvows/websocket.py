@@ -0,0 +1,335 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+"""
+WebSocket vows: ``TornadoWebSocketContext`` connects to the
+``WebSocketHandler`` of the app under test with ``WebSocketClient``, a
+minimal RFC 6455 client (Tornado only ships the server side), and exchanges
+batches of messages with it.
+"""
+
+import array
+import base64
+import collections
+import hashlib
+import os
+import socket
+import struct
+import time
+import urlparse
+
+from tornado.httputil import HTTPHeaders
+from tornado.iostream import IOStream
+
+from tornado_pyvows.context import TornadoHTTPContext
+from tornado_pyvows.load import LatencyPercentiles
+
+_ACCEPT_MAGIC = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+OPCODE_CONTINUATION = 0x0
+OPCODE_TEXT = 0x1
+OPCODE_BINARY = 0x2
+OPCODE_CLOSE = 0x8
+OPCODE_PING = 0x9
+OPCODE_PONG = 0xA
+
+
+def _mask(mask, data):
+    masked = array.array('B', data)
+    mask = array.array('B', mask)
+    for index in xrange(len(masked)):
+        masked[index] ^= mask[index % 4]
+    return masked.tostring()
+
+
+class WebSocketClient(object):
+    """
+    Opens a WebSocket connection to ``url`` (``ws://`` or ``http://``), or
+    to the server listening on the Unix domain socket at ``socket_path`` if
+    given, and calls ``callback`` with the client once the handshake is
+    over, or with ``error`` set when it failed.
+
+    Received messages (unicode for text frames, str for binary ones) are
+    handed to ``message_callback`` if it is set, or kept in ``messages`` as
+    ``(time received, message)`` tuples otherwise.
+    """
+
+    def __init__(self, io_loop, url, callback, headers=None,
+                 socket_path=None):
+        parsed = urlparse.urlsplit(url)
+        if parsed.scheme not in ('ws', 'http'):
+            raise ValueError('Unsupported WebSocket url: %s' % url)
+        self.url = url
+        self.io_loop = io_loop
+        self.messages = collections.deque()
+        self.message_callback = None
+        self.error = None
+        self.closed = False
+        self._callback = callback
+        self._key = base64.b64encode(os.urandom(16))
+        self._fragments = []
+        self._fragments_opcode = None
+
+        path = parsed.path or '/'
+        if parsed.query:
+            path += '?' + parsed.query
+        request_headers = HTTPHeaders(headers or {})
+        request_headers.update({
+            'Host': parsed.netloc,
+            'Upgrade': 'websocket',
+            'Connection': 'Upgrade',
+            'Sec-WebSocket-Key': self._key,
+            'Sec-WebSocket-Version': '13',
+        })
+        self._request = 'GET %s HTTP/1.1\r\n%s\r\n' % (path, ''.join(
+            '%s: %s\r\n' % header for header in request_headers.get_all()
+        ))
+
+        if socket_path is not None:
+            family, address = socket.AF_UNIX, socket_path
+        else:
+            family, address = socket.AF_INET, (parsed.hostname,
+                                               parsed.port or 80)
+        self.stream = IOStream(socket.socket(family, socket.SOCK_STREAM),
+                               io_loop=io_loop)
+        self.stream.set_close_callback(self._on_close)
+        self.stream.connect(address, self._on_connect)
+
+    def _on_connect(self):
+        self.stream.write(self._request)
+        self.stream.read_until('\r\n\r\n', self._on_headers)
+
+    def _on_headers(self, data):
+        status_line, _, headers = data.partition('\r\n')
+        headers = HTTPHeaders.parse(headers)
+        accept = base64.b64encode(
+            hashlib.sha1(self._key + _ACCEPT_MAGIC).digest()
+        )
+        if status_line.split(' ')[1:2] != ['101']:
+            self._fail('WebSocket handshake failed: %s' % status_line)
+        elif headers.get('Sec-WebSocket-Accept') != accept:
+            self._fail('WebSocket handshake failed: bad Sec-WebSocket-Accept')
+        else:
+            self._run_callback()
+            self._read_frame()
+
+    def _fail(self, message):
+        self.error = IOError(message)
+        self.stream.close()
+
+    def _run_callback(self):
+        callback, self._callback = self._callback, None
+        if callback is not None:
+            callback(self)
+
+    def _on_close(self):
+        self.closed = True
+        if self._callback is not None and self.error is None:
+            self.error = IOError('WebSocket connection closed')
+        self._run_callback()
+        if self.message_callback is not None:
+            # lets whoever waits for messages notice the connection is gone
+            self.message_callback(None)
+
+    def _read_frame(self):
+        if not self.stream.closed():
+            self.stream.read_bytes(2, self._on_frame_start)
+
+    def _on_frame_start(self, data):
+        first, second = struct.unpack('BB', data)
+        self._final = first & 0x80
+        self._opcode = first & 0x0f
+        length = second & 0x7f
+        if length == 126:
+            self.stream.read_bytes(2, lambda data: self._read_payload(
+                struct.unpack('!H', data)[0]))
+        elif length == 127:
+            self.stream.read_bytes(8, lambda data: self._read_payload(
+                struct.unpack('!Q', data)[0]))
+        else:
+            self._read_payload(length)
+
+    def _read_payload(self, length):
+        if length:
+            self.stream.read_bytes(length, self._on_payload)
+        else:
+            self._on_payload('')
+
+    def _on_payload(self, data):
+        opcode = self._opcode
+        if opcode == OPCODE_CLOSE:
+            self.stream.close()
+            return
+        if opcode == OPCODE_PING:
+            self._write_frame(OPCODE_PONG, data)
+        elif opcode in (OPCODE_TEXT, OPCODE_BINARY, OPCODE_CONTINUATION):
+            if opcode != OPCODE_CONTINUATION:
+                self._fragments_opcode = opcode
+                self._fragments = []
+            self._fragments.append(data)
+            if self._final:
+                message = ''.join(self._fragments)
+                if self._fragments_opcode == OPCODE_TEXT:
+                    message = message.decode('utf-8')
+                self._fragments = []
+                self._on_message(message)
+        self._read_frame()
+
+    def _on_message(self, message):
+        if self.message_callback is not None:
+            self.message_callback(message)
+        else:
+            self.messages.append((time.time(), message))
+
+    def _write_frame(self, opcode, data):
+        length = len(data)
+        frame = struct.pack('B', 0x80 | opcode)
+        # frames sent by a client are always masked
+        if length < 126:
+            frame += struct.pack('B', 0x80 | length)
+        elif length <= 0xFFFF:
+            frame += struct.pack('!BH', 0x80 | 126, length)
+        else:
+            frame += struct.pack('!BQ', 0x80 | 127, length)
+        mask = os.urandom(4)
+        self.stream.write(frame + mask + _mask(mask, data))
+
+    def write_message(self, message, binary=False):
+        if isinstance(message, unicode):
+            message = message.encode('utf-8')
+        self._write_frame(OPCODE_BINARY if binary else OPCODE_TEXT, message)
+
+    def close(self):
+        if not self.stream.closed():
+            self._write_frame(OPCODE_CLOSE, struct.pack('!H', 1000))
+            self.stream.close()
+
+
+class WebSocketExchange(LatencyPercentiles):
+    """
+    The replies to a batch of messages, with the message rate and the
+    latencies (the n-th reply being paired with the n-th message sent, or
+    with the last one when there are more replies than messages).
+    """
+
+    def __init__(self, replies, sent_at, received_at, start):
+        self.replies = replies
+        self.sent = len(sent_at)
+        self.received = len(replies)
+        end = received_at[-1] if received_at else time.time()
+        self.elapsed = end - start
+        self.latencies = sorted(
+            received - (sent_at[min(index, len(sent_at) - 1)]
+                        if sent_at else start)
+            for index, received in enumerate(received_at)
+        )
+
+    @property
+    def messages_per_second(self):
+        if not self.elapsed:
+            return 0.0
+        return self.received / self.elapsed
+
+    def __repr__(self):
+        return ('WebSocketExchange(sent=%d, received=%d, rate=%.1f/s, '
+                'p50=%.2fms, p95=%.2fms, p99=%.2fms)' % (
+                    self.sent, self.received, self.messages_per_second,
+                    self.p50_ms, self.p95_ms, self.p99_ms))
+
+
+class TornadoWebSocketContext(TornadoHTTPContext):
+    """
+    A ``TornadoHTTPContext`` that also talks to the ``WebSocketHandler`` of
+    its app: ``websocket_connect`` opens a ``WebSocketClient`` (closed on
+    teardown) and ``exchange`` sends a batch of messages at once, returning
+    the replies in a ``WebSocketExchange``.
+    """
+
+    def __init__(self, parent, *args, **kwargs):
+        TornadoHTTPContext.__init__(self, parent, *args, **kwargs)
+        super(TornadoWebSocketContext, self).ignore(
+            'websocket_connect', 'exchange'
+        )
+
+    def teardown(self):
+        for connection in vars(self).pop('_websockets', ()):
+            connection.close()
+        TornadoHTTPContext.teardown(self)
+
+    def websocket_connect(self, path, headers=None, timeout=5):
+        """Connects to ``path`` (or an absolute url), returning the
+        ``WebSocketClient``; raises when the handshake failed."""
+        url = self.get_url(path)
+        socket_path = None
+        if self.port is None and not path.startswith('http'):
+            # the server of a ``unix_socket`` context
+            socket_path = self.socket_path
+        headers = self._add_isolation_key({'headers': headers})['headers']
+        connection = WebSocketClient(self.io_loop, url, self.stop, headers,
+                                     socket_path)
+        vars(self).setdefault('_websockets', []).append(connection)
+        self.wait(timeout=timeout)
+        if connection.error is not None:
+            raise connection.error
+        return connection
+
+    def exchange(self, connection, messages, replies=None, binary=False,
+                 timeout=5):
+        """
+        Sends all of ``messages`` without waiting in between, then waits for
+        ``replies`` messages (one per message sent by default) or for the
+        connection to be closed.
+
+        :param connection:
+            A ``WebSocketClient`` or the path to open one to.
+        :param replies:
+            How many messages to wait for; with no ``messages`` this collects
+            what the handler pushes.
+        """
+        if not isinstance(connection, WebSocketClient):
+            connection = self.websocket_connect(connection)
+        if replies is None:
+            replies = len(messages)
+
+        received, received_at = [], []
+        # messages pushed before the exchange count as replies
+        while connection.messages and len(received) < replies:
+            when, message = connection.messages.popleft()
+            received.append(message)
+            received_at.append(when)
+
+        def on_message(message):
+            if message is None:
+                pass
+            elif len(received) < replies:
+                received.append(message)
+                received_at.append(time.time())
+            else:
+                # left for the next exchange
+                connection.messages.append((time.time(), message))
+            self.stop()
+
+        def is_over():
+            return len(received) >= replies or connection.closed
+
+        start = time.time()
+        sent_at = []
+        connection.message_callback = on_message
+        try:
+            for message in messages:
+                sent_at.append(time.time())
+                connection.write_message(message, binary=binary)
+            if not is_over():
+                self.wait(is_over, timeout=timeout)
+        finally:
+            connection.message_callback = None
+
+        return WebSocketExchange(received, sent_at, received_at,
+                                 min([start] + received_at))
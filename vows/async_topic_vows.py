@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import time
+
+import tornado.web
+from tornado import gen
+
+from pyvows import Vows, expect
+from tornado_pyvows import TornadoContext, TornadoHTTPContext
+from tornado_pyvows.response import Response
+from tornado_pyvows.topics import Return
+
+from vows.test_app import DelayedHandler, MainPageHandler
+
+
+@Vows.batch
+class AsyncTopics(TornadoHTTPContext):
+    reuse_http_server = True
+
+    def get_app(self):
+        return tornado.web.Application([
+            (r"/", MainPageHandler),
+            (r"/delayed", DelayedHandler),
+        ])
+
+    class YieldingATask(TornadoHTTPContext):
+
+        def topic(self):
+            response = yield self.async_fetch('/')
+            raise Return(response.body)
+
+        def should_be_the_returned_value(self, topic):
+            expect(topic).to_equal('Hello, world')
+
+        class UsingTheParentTopic(TornadoHTTPContext):
+
+            def topic(self, body):
+                response = yield self.async_fetch('/', method='POST',
+                                                  body='body=%s' % body)
+                raise Return(response.body)
+
+            def should_receive_the_resolved_parent_topic(self, topic):
+                expect(topic).to_equal('{"body": "Hello, world"}')
+
+    class YieldingATaskForAResponse(TornadoHTTPContext):
+
+        def topic(self):
+            response = yield self.async_fetch(
+                '/', method='POST', body='name=value'
+            )
+            raise Return(response)
+
+        def should_get_the_cached_views(self, topic):
+            expect(topic).to_be_instance_of(Response)
+            expect(topic.json_path('name')).to_equal('value')
+
+    class YieldingAList(TornadoHTTPContext):
+
+        def topic(self):
+            start = time.time()
+            responses = yield [
+                self.async_fetch('/delayed?delay=0.2&id=%d' % index)
+                for index in range(3)
+            ]
+            raise Return((responses, time.time() - start))
+
+        def should_keep_the_order(self, topic):
+            responses, _ = topic
+            expect([response.body for response in responses]).to_equal(
+                ['0', '1', '2'])
+
+        def should_run_the_requests_at_the_same_time(self, topic):
+            _, elapsed = topic
+            expect(elapsed).to_be_lesser_than(0.5)
+
+    class WithoutReturn(TornadoHTTPContext):
+
+        def topic(self):
+            yield self.async_fetch('/')
+
+        def should_be_none(self, topic):
+            expect(topic).to_be_null()
+
+    class RaisingAnError(TornadoHTTPContext):
+
+        @Vows.capture_error
+        def topic(self):
+            yield self.async_fetch('/')
+            raise ValueError('after the fetch')
+
+        def should_be_the_error(self, topic):
+            expect(topic).to_be_an_error_like(ValueError)
+
+
+@Vows.batch
+class AsyncTopicsOnTheIOLoop(TornadoContext):
+
+    def topic(self):
+        value = yield gen.Task(self.io_loop.add_callback)
+        raise Return(value)
+
+    def should_run_the_tasks_on_the_ioloop(self, topic):
+        expect(topic).to_be_null()
+
+    class GenerativeTopics(TornadoContext):
+
+        def topic(self):
+            for value in (1, 2, 3):
+                yield value
+
+        def should_still_be_enumerated(self, topic):
+            expect(topic).to_be_lesser_than(4)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import json
+import os
+import shutil
+import tempfile
+
+from pyvows import Vows, expect
+from tornado_pyvows import benchmarks
+
+
+#: Cheap benchmarks, in process and without writing to stderr, checked on
+#: every run; set the environment variable to go through the whole suite.
+SMOKE = ('attribute_lookup', 'multipart_encoding')
+FULL_SUITE = 'TORNADO_PYVOWS_BENCHMARK_VOWS'
+
+
+def load_report(write):
+    directory = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(directory, 'benchmarks.json')
+        write(filename)
+        with open(filename) as report_file:
+            return json.load(report_file)
+    finally:
+        shutil.rmtree(directory)
+
+
+@Vows.batch
+class Benchmarks(Vows.Context):
+
+    def topic(self):
+        return load_report(lambda filename: benchmarks.write_report(
+            benchmarks.run(SMOKE, scale=0.01), filename
+        ))
+
+    def should_have_the_report_format(self, topic):
+        expect(topic['format']).to_equal(benchmarks.FORMAT)
+        expect(topic['environment']).to_include('tornado')
+
+    def should_run_the_given_benchmarks(self, topic):
+        names = set(result['benchmark'] for result in topic['results'])
+        expect(sorted(names)).to_equal(list(SMOKE))
+
+    def should_sort_the_results(self, topic):
+        keys = [(result['benchmark'], result['metric'])
+                for result in topic['results']]
+        expect(keys).to_equal(sorted(keys))
+
+    def should_measure_something(self, topic):
+        for result in topic['results']:
+            expect(result['value']).to_be_greater_than(0)
+            expect(result['iterations']).to_be_greater_than(0)
+
+
+@Vows.batch
+@Vows.skip_if(not os.environ.get(FULL_SUITE),
+              'set %s to run every benchmark' % FULL_SUITE)
+class TheWholeBenchmarkSuite(Vows.Context):
+
+    def topic(self):
+        return load_report(lambda filename: benchmarks.main(
+            ['--scale', '0.01', '--output', filename]
+        ))
+
+    def should_run_every_benchmark(self, topic):
+        names = set(result['benchmark'] for result in topic['results'])
+        expect(sorted(names)).to_equal(list(benchmarks.BENCHMARKS))
+
+    def should_measure_something(self, topic):
+        for result in topic['results']:
+            expect(result['value']).to_be_greater_than(0)
@@ -8,20 +8,24 @@
 # http://www.opensource.org/licenses/mit-license
 # Copyright (c) 2011 Rafael Caricio rafael@caricio.com
 import json
+import os
 
 from tornado_pyvows import TornadoHTTPContext
 from pyvows import Vows, expect
 
-REQUESTBIN_BASE_URL = 'http://requestb.in'
+# responses recorded from http://requestb.in, replayed by a local stand-in
+CASSETTE = os.path.join(os.path.dirname(__file__), 'cassettes',
+                        'requestbin.json')
 
 
 @Vows.batch
 class Post(TornadoHTTPContext):
-    def setup(self):
-        self.initialize_ioloop()
+
+    def get_cassette(self):
+        return CASSETTE
 
     def topic(self):
-        response = self.post('%s/api/v1/bins' % REQUESTBIN_BASE_URL)
+        response = self.post(self.stand_in.get_url('/api/v1/bins'))
         requestbin_id = json.loads(response.body)['name']
         return (requestbin_id, response)
 
@@ -29,12 +33,16 @@ class Post(TornadoHTTPContext):
         _, response = topic
         expect(response.code).to_equal(200)
 
+    def should_take_the_recorded_time(self, topic):
+        _, response = topic
+        expect(response.request_time).to_be_greater_than(0.05)
+
     class Get(TornadoHTTPContext):
 
         def topic(self, post_response):
             requestbin_id, response = post_response
             get_response = self.get(
-                '%s/%s' % (REQUESTBIN_BASE_URL, requestbin_id)
+                self.stand_in.get_url('/%s' % requestbin_id)
             )
             return get_response
 
@@ -46,7 +54,7 @@ class Post(TornadoHTTPContext):
         def topic(self, post_response):
             requestbin_id, response = post_response
             delete_response = self.delete(
-                '%s/%s' % (REQUESTBIN_BASE_URL, requestbin_id)
+                self.stand_in.get_url('/%s' % requestbin_id)
             )
             return delete_response
 
@@ -58,7 +66,7 @@ class Post(TornadoHTTPContext):
         def topic(self, post_response):
             requestbin_id, response = post_response
             head_response = self.head(
-                '%s/%s' % (REQUESTBIN_BASE_URL, requestbin_id)
+                self.stand_in.get_url('/%s' % requestbin_id)
             )
             return head_response
 
@@ -70,7 +78,7 @@ class Post(TornadoHTTPContext):
         def topic(self, post_response):
             requestbin_id, response = post_response
             put_response = self.put(
-                '%s/%s' % (REQUESTBIN_BASE_URL, requestbin_id), body=''
+                self.stand_in.get_url('/%s' % requestbin_id), body=''
             )
             return put_response
 
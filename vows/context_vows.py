@@ -69,22 +69,22 @@ class Application(TornadoHTTPContext):
 
         def the_response_should_contain_upload(self, topic):
             _, _, response = topic
-            body = json.loads(response.body)
+            body = response.json
             expect(body).to_include('upload')
 
         def the_response_should_contain_filename(self, topic):
             _, _, response = topic
-            body = json.loads(response.body)['upload']
+            body = response.json['upload']
             expect(body).to_include('filename')
 
         def the_filename_should_be_the_same(self, topic):
             _, _, response = topic
-            body = json.loads(response.body)['upload']
+            body = response.json['upload']
             expect(body['filename']).to_include('the_file_name')
 
         def the_file_should_have_the_same_content(self, topic):
             _, _, response = topic
-            body = json.loads(response.body)['upload']['body']
+            body = response.json['upload']['body']
             expect(body).to_equal('This is the file content!')
 
     class WhenPostWithMultipleFiles(WhenPostWithFileUpload):
@@ -98,22 +98,22 @@ class Application(TornadoHTTPContext):
         
         def the_response_should_contain_second_file(self, topic):
             _, _, response = topic
-            body = json.loads(response.body)
+            body = response.json
             expect(body).to_include('second_file')
 
         def the_response_should_contain_filename(self, topic):
             _, _, response = topic
-            body = json.loads(response.body)['second_file']
+            body = response.json['second_file']
             expect(body).to_include('filename')
 
         def the_second_filename_should_be_the_same(self, topic):
             _, _, response = topic
-            body = json.loads(response.body)['second_file']
+            body = response.json['second_file']
             expect(body['filename']).to_include('other_file_name')
 
         def the_content_of_the_second_file_should_be_the_same(self, topic):
             _, _, response = topic
-            body = json.loads(response.body)['second_file']['body']
+            body = response.json['second_file']['body']
             expect(body).to_equal('Different content')
 
     class WhenPostWithFileUploadAndArguments(WhenPostWithFileUpload):
@@ -127,12 +127,12 @@ class Application(TornadoHTTPContext):
         
         def the_response_should_contain_argument(self, topic):
             _, _, response = topic
-            body = json.loads(response.body)
+            body = response.json
             expect(body).to_include('argument')
 
         def the_argument_should_have_value(self, topic):
             _, _, response = topic
-            argument = json.loads(response.body)['argument']
+            argument = response.json['argument']
             expect(argument).to_equal('value')
 
 
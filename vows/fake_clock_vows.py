@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import datetime
+import time
+
+import tornado.ioloop
+import tornado.web
+
+from pyvows import Vows, expect
+from tornado_pyvows import TornadoContext, TornadoHTTPContext
+from tornado_pyvows.clock import FakeClockIOLoop
+
+from vows.test_app import DelayedHandler
+
+
+def retry(io_loop, attempt, delays, callback):
+    """Calls ``attempt`` until it returns True, waiting ``delays`` between
+    the attempts."""
+    delays = list(delays)
+
+    def run():
+        if attempt() or not delays:
+            callback()
+        else:
+            io_loop.add_timeout(io_loop.time() + delays.pop(0), run)
+    run()
+
+
+@Vows.batch
+class FakeClock(TornadoContext):
+    fake_clock = True
+
+    def should_run_on_a_fake_clock_ioloop(self, topic):
+        expect(self.io_loop).to_be_instance_of(FakeClockIOLoop)
+
+    class RetryingWithBackoff(TornadoContext):
+
+        def topic(self):
+            attempts = []
+            done = []
+
+            def attempt():
+                attempts.append(self.io_loop.time() - start)
+                return len(attempts) == 4
+
+            start = self.io_loop.time()
+            wall_clock_start = time.time()
+            retry(self.io_loop, attempt, [1, 2, 4, 8],
+                  lambda: done.append(True))
+            self.advance(3)
+            done_after_3s = bool(done)
+            self.advance(4)
+            return (attempts, done_after_3s, done,
+                    time.time() - wall_clock_start)
+
+        def should_attempt_at_the_virtual_deadlines(self, topic):
+            expect(topic[0]).to_equal([0, 1, 3, 7])
+
+        def should_only_fire_the_due_timeouts(self, topic):
+            expect(topic[1]).to_be_false()
+            expect(topic[2]).to_equal([True])
+
+        def should_not_sleep(self, topic):
+            expect(topic[3]).to_be_lesser_than(0.5)
+
+    class WithTimedeltaDeadlines(TornadoContext):
+
+        def topic(self):
+            fired = []
+            self.io_loop.add_timeout(datetime.timedelta(minutes=10),
+                                     lambda: fired.append(self.io_loop.time()))
+            start = self.io_loop.time()
+            self.advance(599)
+            before = list(fired)
+            self.advance(1)
+            return before, [when - start for when in fired]
+
+        def should_fire_exactly_at_the_deadline(self, topic):
+            expect(topic[0]).to_equal([])
+            expect(topic[1]).to_equal([600])
+
+    class Waiting(TornadoContext):
+
+        def topic(self):
+            self.io_loop.add_timeout(time.time() + 1, self.stop)
+            try:
+                self.wait(timeout=0.05)
+            except AssertionError as error:
+                return error
+
+        def should_time_out_on_the_wall_clock(self, topic):
+            expect(str(topic)).to_include('timed out')
+
+    class RunningUntilIdle(TornadoContext):
+
+        def topic(self):
+            calls = []
+            self.io_loop.add_callback(
+                lambda: self.io_loop.add_callback(lambda: calls.append(1))
+            )
+            self.run_until_idle()
+            return calls
+
+        def should_run_the_callbacks_they_add(self, topic):
+            expect(topic).to_equal([1])
+
+
+class FakeClockHandler(TornadoHTTPContext):
+    # DelayedHandler computes its deadline from time.time(): each batch
+    # starts a clock of its own
+    fake_clock = True
+
+    def get_app(self):
+        return tornado.web.Application([
+            (r"/delayed", DelayedHandler),
+        ])
+
+
+@Vows.batch
+class AFakeClockHandlerScheduling(FakeClockHandler):
+
+    def topic(self):
+        wall_clock_start = time.time()
+        self.http_client.fetch(self.get_url('/delayed?delay=10&id=a'),
+                               self.stop)
+        self.run_io_until()
+        scheduled = self.io_loop.pending_timeouts()
+        self.advance(11)
+        return self.wait(), scheduled, time.time() - wall_clock_start
+
+    def should_answer_once_the_clock_moved(self, topic):
+        expect(topic[0].code).to_equal(200)
+        expect(topic[0].body).to_equal('a')
+
+    def should_schedule_on_the_fake_clock(self, topic):
+        # the request timeout of the client and the one of the handler
+        expect(topic[1]).to_equal(2)
+
+    def should_not_sleep(self, topic):
+        expect(topic[2]).to_be_lesser_than(5)
+
+
+@Vows.batch
+class AFakeClockHandlerBeforeItsDeadline(FakeClockHandler):
+
+    @Vows.capture_error
+    def topic(self):
+        answered = []
+        self.http_client.fetch(self.get_url('/delayed?delay=10'),
+                               answered.append)
+        self.run_io_until()
+        self.advance(9)
+        self.run_io_until(lambda: answered, timeout=0.05)
+
+    def should_not_answer(self, topic):
+        expect(topic).to_be_an_error_like(AssertionError)
+
+
+@Vows.batch
+class TheGlobalIOLoopAroundAFakeClock(TornadoContext):
+    fake_clock = True
+
+    def topic(self):
+        seen = []
+        self.io_loop.add_callback(
+            lambda: seen.append(tornado.ioloop.IOLoop.instance())
+        )
+        self.run_until_idle()
+        return seen
+
+    def should_be_the_fake_clock_while_it_runs(self, topic):
+        expect(topic).to_equal([self.io_loop])
+
+    def should_be_put_back_afterwards(self, topic):
+        expect(tornado.ioloop.IOLoop.instance()).Not.to_be_instance_of(
+            FakeClockIOLoop)
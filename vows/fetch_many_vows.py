@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import time
+
+import tornado.web
+
+from pyvows import Vows, expect
+from tornado_pyvows import TornadoHTTPContext
+
+from vows.test_app import DelayedHandler, MainPageHandler
+
+
+@Vows.batch
+class FetchMany(TornadoHTTPContext):
+    def get_app(self):
+        return tornado.web.Application([
+            (r"/", MainPageHandler),
+            (r"/delayed", DelayedHandler),
+        ])
+
+    class WhenSendingSlowRequests(TornadoHTTPContext):
+
+        def topic(self):
+            start = time.time()
+            responses = self.fetch_many(
+                ['/delayed?id=%d&delay=0.2' % index for index in range(5)]
+            )
+            return (time.time() - start, responses)
+
+        def should_run_them_concurrently(self, topic):
+            elapsed, _ = topic
+            expect(elapsed).to_be_lesser_than(0.6)
+
+        def should_return_the_responses_in_order(self, topic):
+            _, responses = topic
+            expect([response.body for response in responses]).to_equal(
+                ['0', '1', '2', '3', '4'])
+
+    class WithAConcurrencyLimit(TornadoHTTPContext):
+
+        def topic(self):
+            start = time.time()
+            self.fetch_many(
+                ['/delayed?delay=0.2'] * 4, concurrency=2
+            )
+            return time.time() - start
+
+        def should_wait_for_each_window(self, topic):
+            expect(topic).to_be_greater_than(0.4)
+
+    class WithPerRequestArguments(TornadoHTTPContext):
+
+        def topic(self):
+            return self.fetch_many([
+                '/',
+                ('/', {'method': 'HEAD'}),
+                ('/', {'method': 'POST', 'body': 'message=hi'}),
+            ])
+
+        def should_apply_them_to_each_request(self, topic):
+            expect([response.code for response in topic]).to_equal(
+                [200, 204, 200])
+
+    class WithNoRequests(TornadoHTTPContext):
+
+        def topic(self):
+            return self.fetch_many([])
+
+        def should_be_empty(self, topic):
+            expect(topic).to_be_empty()
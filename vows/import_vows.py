@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import os
+import subprocess
+import sys
+
+from pyvows import Vows, expect
+
+import tornado_pyvows
+from tornado_pyvows import instrumentation
+
+ROOT = os.path.dirname(os.path.dirname(tornado_pyvows.__file__))
+
+
+@Vows.batch
+class ImportingTornadoPyvows(Vows.Context):
+
+    def topic(self):
+        env = instrumentation.child_environ()
+        env['PYTHONPATH'] = ROOT
+        command = [
+            sys.executable, '-c',
+            'import sys, tornado_pyvows; print " ".join(sys.modules)'
+        ]
+        process = subprocess.Popen(command, env=env, stdout=subprocess.PIPE)
+        output = process.communicate()[0]
+        if process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, command)
+        return set(output.split())
+
+    def should_not_import_urllib3(self, topic):
+        expect(topic).Not.to_include('urllib3')
+
+    def should_not_import_pycurl(self, topic):
+        expect(topic).Not.to_include('pycurl')
+
+    def should_not_import_the_deterministic_profiler(self, topic):
+        expect(topic).Not.to_include('cProfile')
+        expect(topic).Not.to_include('pstats')
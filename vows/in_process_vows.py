@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import json
+
+import tornado.web
+
+from pyvows import Vows, expect
+from tornado_pyvows import TornadoHTTPContext
+
+from vows.test_app import MainPageHandler
+
+
+@Vows.batch
+class InProcessApplication(TornadoHTTPContext):
+    in_process_transport = True
+
+    def get_app(self):
+        return tornado.web.Application([
+            (r"/", MainPageHandler),
+            (r"/redirect", tornado.web.RedirectHandler, {'url': '/'}),
+        ])
+
+    def should_not_bind_a_port(self, topic):
+        expect(self.port).to_be_null()
+
+    class GoodRequest(TornadoHTTPContext):
+
+        def topic(self):
+            return self.get('/')
+
+        def should_not_start_a_server(self, topic):
+            expect(vars(self)).Not.to_include('http_server')
+
+        def the_response_should_be_ok(self, topic):
+            expect(topic.code).to_equal(200)
+
+        def should_be_hello_world(self, topic):
+            expect(topic.body).to_equal('Hello, world')
+
+        def should_have_the_headers(self, topic):
+            expect(topic.headers['Content-Type']).to_include('text/html')
+
+    class HeadRequest(TornadoHTTPContext):
+
+        def topic(self):
+            return self.head('/')
+
+        def should_have_the_handler_status(self, topic):
+            expect(topic.code).to_equal(204)
+
+    class WhenPostWithUrlEncodedFormData(TornadoHTTPContext):
+
+        def topic(self):
+            return self.post('/', data={'message': 'Hello'})
+
+        def the_response_should_be_the_input(self, topic):
+            expect(json.loads(topic.body)).to_equal({'message': 'Hello'})
+
+    class WhenPostWithFileUpload(TornadoHTTPContext):
+
+        def topic(self):
+            data = {'upload': ('the_file_name', 'This is the file content!')}
+            return self.post('/', data=data, multipart=True)
+
+        def the_file_should_have_the_same_content(self, topic):
+            body = json.loads(topic.body)['upload']
+            expect(body['body']).to_equal('This is the file content!')
+
+    class WhenFollowingARedirect(TornadoHTTPContext):
+
+        def topic(self):
+            return self.get('/redirect')
+
+        def should_end_at_the_target(self, topic):
+            expect(topic.body).to_equal('Hello, world')
+
+    class WhenTheUrlDoesNotExist(TornadoHTTPContext):
+
+        def topic(self):
+            return self.get('/missing')
+
+        def should_be_not_found(self, topic):
+            expect(topic.code).to_equal(404)
+
+        def should_have_an_error(self, topic):
+            expect(topic.error).Not.to_be_null()
+
+    class UsingTheHTTPClientDirectly(TornadoHTTPContext):
+
+        def topic(self):
+            self.http_client.fetch(self.get_url('/'), self.stop)
+            return self.wait()
+
+        def should_be_hello_world(self, topic):
+            expect(topic.body).to_equal('Hello, world')
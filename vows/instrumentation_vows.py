@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import tornado.web
+
+from pyvows import Vows, expect
+from tornado_pyvows import TornadoHTTPContext, instrumentation
+
+from vows.test_app import MainPageHandler
+
+
+@Vows.batch
+class Instrumentation(TornadoHTTPContext):
+    def setup(self):
+        # only records while this batch runs, unless it was already on
+        self.was_enabled = instrumentation.is_enabled()
+        instrumentation.enable()
+        TornadoHTTPContext.setup(self)
+
+    def teardown(self):
+        TornadoHTTPContext.teardown(self)
+        if not self.was_enabled:
+            instrumentation.disable()
+
+    def get_app(self):
+        return tornado.web.Application([
+            (r"/", MainPageHandler),
+        ])
+
+    class AfterTwoRequests(TornadoHTTPContext):
+
+        def topic(self):
+            self.get('/')
+            self.get('/')
+            return instrumentation.report()['contexts'][
+                'Instrumentation.AfterTwoRequests']
+
+        def should_time_each_fetch(self, topic):
+            expect(topic['fetch']).to_length(2)
+
+        def should_count_the_ioloop_cycles(self, topic):
+            expect(topic['ioloop_cycles']).to_equal(2)
+
+        def should_time_the_setup(self, topic):
+            expect(topic['setup']).to_be_greater_than(0)
+
+        def should_not_have_timed_out(self, topic):
+            expect(topic['timeouts']).to_equal(0)
+
+        def should_be_among_the_slowest(self, topic):
+            paths = [path for path, _ in instrumentation.slowest(1000)]
+            expect(paths).to_include('Instrumentation.AfterTwoRequests')
+
+
+@Vows.batch
+class MergingTimings(Vows.Context):
+
+    def topic(self):
+        recorded = instrumentation.pop_timings()
+        try:
+            worker = {'Worker.Batch': {
+                'setup': 0.5, 'teardown': 0.25, 'fetch': [0.1],
+                'wait': [0.1], 'ioloop_cycles': 1, 'timeouts': 0,
+            }}
+            instrumentation.merge(worker)
+            instrumentation.merge(worker)
+            return instrumentation.report()['contexts']['Worker.Batch']
+        finally:
+            instrumentation.pop_timings()
+            instrumentation.merge(recorded)
+
+    def should_add_up_the_measures(self, topic):
+        expect(topic['setup']).to_equal(1.0)
+        expect(topic['ioloop_cycles']).to_equal(2)
+
+    def should_keep_every_fetch(self, topic):
+        expect(topic['fetch']).to_equal([0.1, 0.1])
+
+    def should_compute_the_total(self, topic):
+        expect(topic['total']).to_be_greater_than(1.6)
+
+
+@Vows.batch
+class ChildEnviron(Vows.Context):
+
+    def topic(self):
+        return instrumentation.child_environ({
+            'TORNADO_PYVOWS_TIMINGS': 'timings.json',
+            'TORNADO_PYVOWS_MEMORY': 'memory.json',
+            'PATH': '/bin',
+        })
+
+    def should_drop_the_report_variables(self, topic):
+        expect(topic).to_equal({'PATH': '/bin'})
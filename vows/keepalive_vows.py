@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import tornado.web
+from tornado.curl_httpclient import CurlAsyncHTTPClient
+
+from pyvows import Vows, expect
+from tornado_pyvows import TornadoContext, TornadoHTTPContext
+from tornado_pyvows.keepalive import KeepAliveHTTPClient
+
+from vows.test_app import MainPageHandler
+
+
+@Vows.batch
+class KeepAlive(TornadoHTTPContext):
+    keep_alive_http_client = True
+    reuse_http_server = True
+
+    def get_app(self):
+        return tornado.web.Application([
+            (r"/", MainPageHandler),
+        ])
+
+    def should_use_the_keep_alive_client(self, topic):
+        expect(self.http_client).to_be_instance_of(KeepAliveHTTPClient)
+
+    class AfterSeveralRequests(TornadoHTTPContext):
+
+        def topic(self):
+            before = dict(self.http_client.stats)
+            responses = [self.get('/') for _ in range(5)]
+            after = self.http_client.stats
+            return (responses, dict(
+                (name, after[name] - before[name]) for name in after
+            ))
+
+        def should_be_hello_world(self, topic):
+            responses, _ = topic
+            expect([response.body for response in responses]).to_equal(
+                ['Hello, world'] * 5)
+
+        def should_count_every_request(self, topic):
+            _, stats = topic
+            expect(stats['requests']).to_equal(5)
+
+        def should_reuse_the_connection(self, topic):
+            _, stats = topic
+            expect(stats['connections']).to_be_lesser_than(2)
+            expect(stats['reused']).to_be_greater_than(3)
+
+
+@Vows.batch
+class AKeepAliveClientOnALoopWithACurlClient(TornadoContext):
+
+    def topic(self):
+        curl_client = CurlAsyncHTTPClient(io_loop=self.io_loop)
+        keep_alive_client = KeepAliveHTTPClient(io_loop=self.io_loop)
+        subclass = type('CountingHTTPClient', (KeepAliveHTTPClient,), {})
+        return curl_client, keep_alive_client, subclass(io_loop=self.io_loop)
+
+    def should_be_its_own_instance(self, topic):
+        curl_client, keep_alive_client, _ = topic
+        expect(keep_alive_client).to_be_instance_of(KeepAliveHTTPClient)
+        expect(keep_alive_client is curl_client).to_be_false()
+
+    def should_be_shared_on_the_loop(self, topic):
+        _, keep_alive_client, _ = topic
+        expect(KeepAliveHTTPClient(io_loop=self.io_loop) is
+               keep_alive_client).to_be_true()
+
+    def should_leave_the_curl_client_shared(self, topic):
+        curl_client, _, _ = topic
+        expect(CurlAsyncHTTPClient(io_loop=self.io_loop) is
+               curl_client).to_be_true()
+
+    def should_give_subclasses_their_own_instance_too(self, topic):
+        curl_client, keep_alive_client, subclass_client = topic
+        expect(subclass_client.__class__.__name__).to_equal(
+            'CountingHTTPClient')
+        expect(subclass_client is keep_alive_client).to_be_false()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import tornado.web
+
+from pyvows import Vows, expect
+from tornado_pyvows import TornadoHTTPContext
+
+from vows.test_app import MainPageHandler
+
+
+@Vows.batch
+class LazyServer(TornadoHTTPContext):
+    lazy_http_server = True
+
+    def get_app(self):
+        return tornado.web.Application([
+            (r"/", MainPageHandler),
+        ])
+
+    def topic(self):
+        return vars(self).copy()
+
+    def should_not_start_a_server_before_a_request(self, topic):
+        expect(topic).Not.to_include('http_server')
+        expect(topic).Not.to_include('port')
+
+    class Fetching(TornadoHTTPContext):
+
+        def topic(self):
+            response = self.get('/')
+            return response, vars(self).copy()
+
+        def should_start_the_server_on_the_first_request(self, topic):
+            _, context_vars = topic
+            expect(context_vars).to_include('http_server')
+            expect(context_vars['port']).to_be_numeric()
+
+        def should_be_hello_world(self, topic):
+            response, _ = topic
+            expect(response.body).to_equal('Hello, world')
+
+    class NotFetching(TornadoHTTPContext):
+
+        def topic(self):
+            return vars(self).copy()
+
+        def should_not_start_a_server(self, topic):
+            expect(topic).Not.to_include('http_server')
+
+
+@Vows.batch
+class LazyReusedServer(TornadoHTTPContext):
+    lazy_http_server = True
+    reuse_http_server = True
+
+    def get_app(self):
+        return tornado.web.Application([
+            (r"/", MainPageHandler),
+        ])
+
+    class Child(TornadoHTTPContext):
+
+        def topic(self):
+            response = self.get('/')
+            return response, self.parent.http_server, self.port
+
+        def should_start_the_server_of_the_parent(self, topic):
+            _, server, _ = topic
+            expect(server).Not.to_be_null()
+            expect(vars(self)).Not.to_include('http_server')
+
+        def should_use_the_parent_port(self, topic):
+            _, _, port = topic
+            expect(port).to_equal(self.parent.port)
+
+        def should_be_hello_world(self, topic):
+            response, _, _ = topic
+            expect(response.body).to_equal('Hello, world')
+
+
+@Vows.batch
+class LazyUnixSocketServer(TornadoHTTPContext):
+    lazy_http_server = True
+    unix_socket = True
+
+    def get_app(self):
+        return tornado.web.Application([
+            (r"/", MainPageHandler),
+        ])
+
+    def topic(self):
+        return self.get('/')
+
+    def should_be_hello_world(self, topic):
+        expect(topic.body).to_equal('Hello, world')
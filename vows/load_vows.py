@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import tornado.web
+from tornado.curl_httpclient import CurlAsyncHTTPClient
+from tornado.simple_httpclient import SimpleAsyncHTTPClient
+
+from pyvows import Vows, expect
+from tornado_pyvows import (
+    TornadoContext,
+    TornadoHTTPContext,
+    LoadTestTornadoHTTPContext
+)
+from tornado_pyvows.context import get_max_clients, resize_http_client
+from tornado_pyvows.load import LoadTestResult
+from tornado_pyvows.transport import InProcessHTTPClient
+from tornado_pyvows.unixsocket import UnixSocketHTTPClient
+
+from vows.test_app import DelayedHandler, MainPageHandler
+
+
+@Vows.batch
+class LoadTest(TornadoHTTPContext):
+    reuse_http_server = True
+
+    def get_app(self):
+        return tornado.web.Application([
+            (r"/", MainPageHandler),
+            (r"/delayed", DelayedHandler),
+        ])
+
+    class ForAFixedCount(LoadTestTornadoHTTPContext):
+        load_requests = 200
+        load_concurrency = 20
+
+        def should_make_every_request(self, topic):
+            expect(topic.requests).to_equal(200)
+
+        def should_have_no_errors(self, topic):
+            expect(topic.errors).to_equal(0)
+
+        def should_have_ordered_percentiles(self, topic):
+            expect(topic.p50_ms <= topic.p95_ms <= topic.p99_ms).to_be_true()
+
+        def should_measure_the_throughput(self, topic):
+            expect(topic.requests_per_second).to_be_greater_than(0)
+
+    class ForAFixedDuration(LoadTestTornadoHTTPContext):
+        load_duration = 0.3
+        load_concurrency = 5
+
+        def get_load_request(self):
+            return '/delayed?delay=0.05'
+
+        def should_run_for_the_duration(self, topic):
+            expect(topic.elapsed).to_be_greater_than(0.3)
+
+        def should_run_them_concurrently(self, topic):
+            expect(topic.requests).to_be_greater_than(15)
+
+        def should_measure_the_latency(self, topic):
+            expect(topic.p50_ms).to_be_greater_than(45)
+
+    class WithFailingRequests(LoadTestTornadoHTTPContext):
+        load_requests = 10
+
+        def get_load_request(self):
+            return ('/missing', {'method': 'GET'})
+
+        def should_count_the_errors(self, topic):
+            expect(topic.errors).to_equal(10)
+
+
+@Vows.batch
+class LoadTestOverAUnixSocket(TornadoHTTPContext):
+    unix_socket = True
+
+    def get_app(self):
+        return tornado.web.Application([
+            (r"/delayed", DelayedHandler),
+        ])
+
+    class AboveTheLimitOfTheCurlClient(LoadTestTornadoHTTPContext):
+        load_duration = 0.3
+        load_concurrency = 20
+
+        def get_load_request(self):
+            return '/delayed?delay=0.1'
+
+        def should_still_go_through_the_socket(self, topic):
+            expect(topic.errors).to_equal(0)
+
+        def should_keep_every_request_in_flight(self, topic):
+            # 10 at a time, the default of the curl client, make at most 30
+            expect(topic.requests).to_be_greater_than(40)
+
+
+@Vows.batch
+class TheLimitOfAnHTTPClient(TornadoContext):
+
+    def topic(self):
+        return self.io_loop
+
+    def should_be_the_number_of_curl_handles(self, io_loop):
+        client = CurlAsyncHTTPClient(io_loop=io_loop, max_clients=15,
+                                     force_instance=True)
+        expect(get_max_clients(client)).to_equal(15)
+        client.close()
+
+    def should_be_max_clients_for_the_simple_client(self, io_loop):
+        client = SimpleAsyncHTTPClient(io_loop=io_loop, max_clients=15,
+                                       force_instance=True)
+        expect(get_max_clients(client)).to_equal(15)
+        client.close()
+
+    def should_be_none_in_process(self, io_loop):
+        client = InProcessHTTPClient(tornado.web.Application(), io_loop)
+        expect(get_max_clients(client)).to_be_null()
+
+    def should_keep_the_socket_path_when_resized(self, io_loop):
+        client = UnixSocketHTTPClient(io_loop=io_loop, socket_path='/tmp/s',
+                                      force_instance=True)
+        resized = resize_http_client(client, 30)
+        expect(resized).to_be_instance_of(UnixSocketHTTPClient)
+        expect(resized.socket_path).to_equal('/tmp/s')
+        expect(get_max_clients(resized)).to_equal(30)
+        resized.close()
+        client.close()
+
+
+@Vows.batch
+class ALoadTestResult(TornadoHTTPContext):
+
+    def topic(self):
+        return LoadTestResult(
+            [index / 1000.0 for index in range(1, 101)], 0, 2.0
+        )
+
+    def should_have_the_nearest_rank_percentiles(self, topic):
+        expect(round(topic.p50_ms)).to_equal(50)
+        expect(round(topic.p95_ms)).to_equal(95)
+        expect(round(topic.p99_ms)).to_equal(99)
+
+    def should_compute_the_requests_per_second(self, topic):
+        expect(topic.requests_per_second).to_equal(50)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import json
+
+import tornado.web
+from tornado.web import RequestHandler
+
+from pyvows import Vows, expect
+from tornado_pyvows import TornadoHTTPContext
+from tornado_pyvows.fixtures import restore
+
+BUILDS = []
+
+
+class StoreHandler(RequestHandler):
+
+    def initialize(self, store):
+        self.store = store
+
+    def get(self):
+        self.write(json.dumps(sorted(self.store['items'])))
+
+    def post(self):
+        self.store['items'].append(self.get_argument('item'))
+
+
+class MemoizedStoreContext(TornadoHTTPContext):
+    memoize_app = True
+
+    def get_app(self):
+        BUILDS.append(None)
+        store = {'items': ['seed']}
+        application = tornado.web.Application([
+            (r"/", StoreHandler, dict(store=store)),
+        ])
+        application.store = store
+        return application
+
+    def get_app_state(self, app):
+        return app.store
+
+    def _add_and_list(self, item):
+        self.post('/', data={'item': item})
+        return json.loads(self.get('/').body), len(BUILDS)
+
+
+@Vows.batch
+class MemoizedApp(MemoizedStoreContext):
+
+    class AddingAnItem(MemoizedStoreContext):
+
+        def topic(self):
+            return self._add_and_list('a')
+
+        def should_see_the_seeded_store_plus_its_item(self, topic):
+            expect(topic[0]).to_equal(['a', 'seed'])
+
+        def should_not_build_the_app_again(self, topic):
+            expect(topic[1]).to_equal(1)
+
+    class AddingAnotherItem(MemoizedStoreContext):
+
+        def topic(self):
+            return self._add_and_list('b')
+
+        def should_not_see_the_items_of_other_contexts(self, topic):
+            expect(topic[0]).to_equal(['b', 'seed'])
+
+        def should_not_build_the_app_again(self, topic):
+            expect(topic[1]).to_equal(1)
+
+
+class Record(object):
+    pass
+
+
+@Vows.batch
+class RestoringState(TornadoHTTPContext):
+
+    def topic(self):
+        record = Record()
+        record.name = 'before'
+        state = ({'a': 1}, [1, 2], set([1]), record)
+        snapshot = ({'b': 2}, [3], set([2]), Record())
+        snapshot[3].name = 'after'
+        restore(state, snapshot)
+        return state, record
+
+    def should_restore_every_container_in_place(self, topic):
+        state, record = topic
+        expect(state[:3]).to_equal(({'b': 2}, [3], set([2])))
+        expect(state[3]).to_equal(record)
+        expect(record.name).to_equal('after')
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import socket
+import time
+
+from tornado.ioloop import IOLoop
+
+from pyvows import Vows, expect
+from tornado_pyvows import TornadoContext, memory
+
+
+class Leaked(object):
+    pass
+
+
+#: what the contexts of ``RecordingGrowth`` leave behind, kept alive
+kept = []
+
+
+class LeavingThingsBehind(TornadoContext):
+    fake_clock = True
+
+    def leave_things_behind(self):
+        kept.extend(Leaked() for _ in range(30))
+        self.io_loop.add_timeout(self.io_loop.time() + 60, lambda: None)
+
+
+@Vows.batch
+class MemoryGrowth(TornadoContext):
+
+    def topic(self):
+        leaked = []
+        io_loop = IOLoop()
+        before = memory.snapshot(io_loop)
+        sock = socket.socket()
+        leaked.extend(Leaked() for _ in range(50))
+        sock.bind(('127.0.0.1', 0))
+        io_loop.add_timeout(time.time() + 60, lambda: None)
+        after = memory.snapshot(io_loop)
+        sock.close()
+        io_loop.close(all_fds=True)
+        return memory.compare(before, after)
+
+    def should_count_the_new_objects(self, topic):
+        expect(topic['objects']).to_be_greater_than(49)
+
+    def should_name_the_types_that_grew(self, topic):
+        expect(topic['top_types']).to_include(
+            ['%s.Leaked' % __name__, 50])
+
+    def should_find_the_lingering_timeout(self, topic):
+        expect(topic['ioloop']['timeouts']).to_equal(1)
+        expect(topic['ioloop']['handlers']).to_equal(0)
+
+    def should_find_the_open_socket(self, topic):
+        if topic['fds'] is not None:
+            expect([target for target in topic['fds']
+                    if target.startswith('socket:')]).to_length(1)
+
+    class WithoutGrowth(TornadoContext):
+
+        def topic(self):
+            before = memory.snapshot(self.io_loop)
+            return memory.compare(before, memory.snapshot(self.io_loop))
+
+        def should_only_count_the_snapshot_itself(self, topic):
+            expect(topic['objects']).to_be_lesser_than(20)
+
+        def should_not_find_open_files(self, topic):
+            expect(topic['fds'] or []).to_be_empty()
+
+
+@Vows.batch
+class RecordingGrowth(TornadoContext):
+
+    def topic(self):
+        # the hooks run right here, so no other context gets recorded
+        was_enabled = memory.is_enabled()
+        memory.enable()
+        try:
+            context = LeavingThingsBehind(self)
+            context.setup()
+            context.leave_things_behind()
+            context.teardown()
+        finally:
+            del kept[:]
+            if not was_enabled:
+                memory.disable()
+        return memory.report()['contexts']
+
+    def should_report_the_context_by_path(self, topic):
+        expect(topic).to_include('RecordingGrowth.LeavingThingsBehind')
+
+    def should_count_what_it_left(self, topic):
+        growth = topic['RecordingGrowth.LeavingThingsBehind']
+        expect(growth['top_types']).to_include(['%s.Leaked' % __name__, 30])
+
+    def should_check_the_ioloop_of_the_context(self, topic):
+        growth = topic['RecordingGrowth.LeavingThingsBehind']
+        expect(growth['ioloop']).to_equal(
+            {'handlers': 0, 'timeouts': 1, 'callbacks': 0})
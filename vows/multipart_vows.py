@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import json
+import string
+import tempfile
+from cStringIO import StringIO
+
+import tornado.web
+
+from pyvows import Vows, expect
+from tornado_pyvows import TornadoHTTPContext
+from tornado_pyvows.multipart import MultipartEncoder, UploadedFile
+
+from vows.test_app import MainPageHandler
+
+LARGE_CONTENT = string.ascii_letters * 20000
+
+
+def large_file():
+    upload = tempfile.NamedTemporaryFile(suffix='.bin')
+    upload.write(LARGE_CONTENT)
+    upload.flush()
+    return upload
+
+
+class StreamedUploads(TornadoHTTPContext):
+    def get_app(self):
+        return tornado.web.Application([
+            (r"/", MainPageHandler),
+        ])
+
+    class WhenUploadingAFilePath(TornadoHTTPContext):
+
+        def topic(self):
+            upload = large_file()
+            response = self.post('/', data={
+                'upload': UploadedFile(upload.name, 'large.bin'),
+                'argument': 'value'
+            }, multipart=True)
+            upload.close()
+            return json.loads(response.body)
+
+        def the_file_should_have_the_same_content(self, topic):
+            expect(topic['upload']['body'] == LARGE_CONTENT).to_be_true()
+
+        def the_filename_should_be_the_given_one(self, topic):
+            expect(topic['upload']['filename']).to_equal('large.bin')
+
+        def the_argument_should_have_value(self, topic):
+            expect(topic['argument']).to_equal('value')
+
+    class WhenUploadingAFileLikeObject(TornadoHTTPContext):
+
+        def topic(self):
+            response = self.post('/', data={
+                'upload': ('the_file_name', StringIO('This is the content!')),
+            }, multipart=True)
+            return json.loads(response.body)['upload']
+
+        def the_file_should_have_the_same_content(self, topic):
+            expect(topic['body']).to_equal('This is the content!')
+
+        def the_filename_should_be_the_same(self, topic):
+            expect(topic['filename']).to_equal('the_file_name')
+
+
+@Vows.batch
+class StreamedUploadsWithTheDefaultClient(StreamedUploads):
+    pass
+
+
+@Vows.batch
+class StreamedUploadsWithCurl(StreamedUploads):
+    keep_alive_http_client = True
+
+
+def sample_encoder():
+    return MultipartEncoder({
+        'upload': ('name.txt', StringIO('x' * 1000)),
+        'argument': u'välue',
+    }, boundary='BOUNDARY', chunk_size=100)
+
+
+@Vows.batch
+class AMultipartEncoder(TornadoHTTPContext):
+    """The topic is the body read from an encoder; the vows reading one
+    themselves build their own."""
+
+    def topic(self):
+        return sample_encoder().read()
+
+    def should_know_its_length_upfront(self, topic):
+        expect(sample_encoder().length).to_equal(len(topic))
+
+    def should_read_the_files_in_bounded_chunks(self, topic):
+        chunks = list(sample_encoder().chunks())
+        expect(chunks).to_include('x' * 100)
+        expect(chunks).Not.to_include('x' * 1000)
+
+    def should_read_in_pieces(self, topic):
+        encoder = sample_encoder()
+        pieces = []
+        while True:
+            piece = encoder.read(7)
+            if not piece:
+                break
+            pieces.append(piece)
+        expect(''.join(pieces)).to_equal(topic)
+
+    def should_read_it_all_again_once_rewound(self, topic):
+        encoder = sample_encoder()
+        encoder.read(7)
+        encoder.rewind()
+        expect(encoder.read()).to_equal(topic)
+
+    def should_guess_the_content_type(self, topic):
+        expect(topic).to_include('Content-Type: text/plain')
+
+    def should_end_with_the_closing_boundary(self, topic):
+        expect(topic.endswith('--BOUNDARY--\r\n')).to_be_true()
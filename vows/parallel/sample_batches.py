@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+"""
+The small suite ``parallel_vows`` runs on two worker processes. Not named
+``*_vows.py``, so the regular runs leave it alone.
+"""
+
+import os
+
+import tornado.ioloop
+import tornado.testing
+import tornado.web
+
+from pyvows import Vows, expect
+from tornado_pyvows import TornadoHTTPContext
+
+
+class HelloHandler(tornado.web.RequestHandler):
+    def get(self):
+        self.write('Hello')
+
+
+class Serving(TornadoHTTPContext):
+    """Answers with where it ran: the worker process, its IOLoop and the
+    first port ``get_unused_port`` hands out there."""
+
+    def get_app(self):
+        return tornado.web.Application([(r'/', HelloHandler)])
+
+    def topic(self):
+        return (self.get('/').body, os.getpid(),
+                id(tornado.ioloop.IOLoop.instance()),
+                tornado.testing.get_unused_port())
+
+    def should_answer(self, topic):
+        expect(topic[0]).to_equal('Hello')
+
+
+@Vows.batch
+class ServingFirst(Serving):
+    pass
+
+
+@Vows.batch
+class ServingSecond(Serving):
+    pass
+
+
+@Vows.batch
+class ServingThird(Serving):
+    pass
+
+
+@Vows.batch
+class ServingFourth(Serving):
+    pass
+
+
+@Vows.batch
+class Failing(Vows.Context):
+
+    def topic(self):
+        return 41
+
+    def should_be_the_answer(self, topic):
+        expect(topic).to_equal(42)
+
+
+@Vows.batch
+class Erroring(Vows.Context):
+
+    def topic(self):
+        raise ValueError('no topic here')
+
+    def should_never_be_checked(self, topic):
+        expect(topic).to_be_null()
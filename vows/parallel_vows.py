@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import ast
+import json
+import os
+import subprocess
+import sys
+
+from pyvows import Vows, expect
+
+import tornado_pyvows
+from tornado_pyvows import instrumentation
+from tornado_pyvows import parallel
+
+ROOT = os.path.dirname(os.path.dirname(tornado_pyvows.__file__))
+SUITE = os.path.join(os.path.dirname(__file__), 'parallel')
+
+# runs the suite on a fresh interpreter, as collecting it here would add its
+# batches to the run in progress
+_SCRIPT = '''
+import json, os, sys
+import tornado.ioloop
+from tornado_pyvows import parallel
+
+io_loop = tornado.ioloop.IOLoop.instance()
+result = parallel.run(sys.argv[1], '*_batches.py', workers=2)
+
+def error(exc_info):
+    return '%s: %s' % (exc_info[0].__name__, exc_info[1])
+
+contexts = {}
+for context in result.contexts:
+    contexts[context['name']] = {
+        'error': context['error'] and error(context['error'].exc_info),
+        'tests': [{
+            'name': test['name'],
+            'succeeded': test['succeeded'],
+            'topic': test['topic'],
+            'error': test['error'] and error((test['error']['type'],
+                                              test['error']['value'])),
+        } for test in context['tests']],
+    }
+sys.stdout.write(json.dumps({
+    'pid': os.getpid(),
+    'ioloop': id(io_loop),
+    'errored_tests': result.errored_tests,
+    'contexts': contexts,
+}))
+'''
+
+SERVING = ['ServingFirst', 'ServingSecond', 'ServingThird', 'ServingFourth']
+
+
+@Vows.batch
+class RunningOnTwoWorkers(Vows.Context):
+
+    def topic(self):
+        env = instrumentation.child_environ()
+        env['PYTHONPATH'] = ROOT
+        command = [sys.executable, '-c', _SCRIPT, SUITE]
+        with open(os.devnull, 'w') as devnull:
+            process = subprocess.Popen(command, env=env,
+                                       stdout=subprocess.PIPE, stderr=devnull)
+            output = process.communicate()[0]
+        if process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, command)
+        return json.loads(output)
+
+    def should_report_every_batch(self, topic):
+        expect(sorted(topic['contexts'])).to_equal(
+            sorted(SERVING + ['Failing', 'Erroring'])
+        )
+
+    def should_count_the_failures_of_every_worker(self, topic):
+        expect(topic['errored_tests']).to_equal(2)
+
+    class TheServingBatches(Vows.Context):
+
+        def topic(self, run):
+            for name in SERVING:
+                test = run['contexts'][name]['tests'][0]
+                yield test, ast.literal_eval(test['topic']), run
+
+        def should_pass(self, topic):
+            test, _, _ = topic
+            expect(test['succeeded']).to_be_true()
+
+        def should_bring_back_the_topic_as_its_repr(self, topic):
+            _, topic, _ = topic
+            expect(topic[0]).to_equal('Hello')
+
+        def should_run_in_a_worker(self, topic):
+            _, topic, run = topic
+            expect(topic[1]).Not.to_equal(run['pid'])
+
+        def should_not_use_the_ioloop_of_the_parent(self, topic):
+            _, topic, run = topic
+            expect(topic[2]).Not.to_equal(run['ioloop'])
+
+        def should_guess_ports_in_the_range_of_its_worker(self, topic):
+            _, topic, _ = topic
+            expect([10000, 10000 + parallel.PORTS_PER_WORKER]).to_include(
+                topic[3] - topic[3] % parallel.PORTS_PER_WORKER
+            )
+
+    class ThePorts(Vows.Context):
+
+        def topic(self, run):
+            ranges = {}
+            for name in SERVING:
+                _, pid, _, port = ast.literal_eval(
+                    run['contexts'][name]['tests'][0]['topic']
+                )
+                ranges.setdefault(
+                    port - port % parallel.PORTS_PER_WORKER, set()
+                ).add(pid)
+            return ranges
+
+        def should_never_be_shared_between_workers(self, topic):
+            for pids in topic.values():
+                expect(pids).to_length(1)
+
+    class TheFailingVow(Vows.Context):
+
+        def topic(self, run):
+            return run['contexts']['Failing']['tests'][0]
+
+        def should_fail(self, topic):
+            expect(topic['succeeded']).to_be_false()
+
+        def should_bring_back_the_assertion_of_the_worker(self, topic):
+            expect(topic['error']).to_match(
+                r'^RemoteError: (.|\n)*AssertionError: Expected topic\(41\) '
+                r'to equal 42'
+            )
+
+    class TheErroringTopic(Vows.Context):
+
+        def topic(self, run):
+            return run['contexts']['Erroring']
+
+        def should_fail_its_vows(self, topic):
+            expect(topic['tests'][0]['succeeded']).to_be_false()
+
+        def should_bring_back_the_error_of_the_worker(self, topic):
+            expect(topic['error']).to_match(
+                r'^RemoteError: (.|\n)*ValueError: no topic here'
+            )
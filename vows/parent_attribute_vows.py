@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+from pyvows import Vows, expect
+from tornado_pyvows import TornadoContext
+
+
+class Context(TornadoContext):
+    pass
+
+
+def nested(depth):
+    root = context = Context(None)
+    for _ in range(depth):
+        context = Context(context)
+    return root, context
+
+
+@Vows.batch
+class ParentAttributes(TornadoContext):
+
+    class WhenDeeplyNested(TornadoContext):
+
+        def topic(self):
+            root, leaf = nested(20)
+            root.some_value = 'root value'
+            return leaf.some_value
+
+        def should_find_the_outermost_value(self, topic):
+            expect(topic).to_equal('root value')
+
+    class WhenTheParentChangesTheValue(TornadoContext):
+
+        def topic(self):
+            root, leaf = nested(3)
+            root.some_value = 'old value'
+            before = leaf.some_value
+            root.some_value = 'new value'
+            return (before, leaf.some_value)
+
+        def should_not_use_the_stale_value(self, topic):
+            expect(topic).to_equal(('old value', 'new value'))
+
+    class WhenACloserParentSetsTheValue(TornadoContext):
+
+        def topic(self):
+            root, leaf = nested(3)
+            root.some_value = 'root value'
+            before = leaf.some_value
+            leaf.parent.some_value = 'parent value'
+            return (before, leaf.some_value)
+
+        def should_use_the_closest_value(self, topic):
+            expect(topic).to_equal(('root value', 'parent value'))
+
+    class WhenTheValueIsDeleted(TornadoContext):
+
+        def topic(self):
+            root, leaf = nested(3)
+            root.some_value = 'root value'
+            leaf.parent.some_value = 'parent value'
+            before = leaf.some_value
+            del leaf.parent.some_value
+            return (before, leaf.some_value)
+
+        def should_fall_back_to_the_outer_value(self, topic):
+            expect(topic).to_equal(('parent value', 'root value'))
+
+    class WhenNoParentHasTheValue(TornadoContext):
+
+        def topic(self):
+            _, leaf = nested(3)
+            return leaf.missing_value
+
+        def should_be_none(self, topic):
+            expect(topic).to_be_null()
@@ -0,0 +1,123 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+from pyvows import Vows, expect
+from tornado_pyvows import TornadoHTTPContext, IsolatedTornadoHTTPContext
+
+from tornado import gen
+from tornado.web import RequestHandler, asynchronous
+
+
+class EchoHandler(RequestHandler):
+
+    @asynchronous
+    @gen.engine
+    def get(self):
+        echo = yield gen.Task(self.echo)
+        self.finish(echo)
+
+    def echo(self, callback=None):
+        callback('echo')
+
+
+def echoing(message):
+    def echo(self, callback=None):
+        callback(message)
+    return echo
+
+
+@Vows.batch
+class PooledIsolation(TornadoHTTPContext):
+    pool_isolated_handlers = True
+
+    def get_handler_spec(self):
+        return (r'^/echo$', EchoHandler)
+
+    class WithAMockedHandler(IsolatedTornadoHTTPContext):
+
+        def topic(self):
+            self.get_test_handler().echo = echoing('mocked echo')
+            return self.fetch('/echo')
+
+        def should_use_the_isolated_handler(self, topic):
+            expect(topic.body).to_equal('mocked echo')
+
+        def should_share_the_server(self, topic):
+            expect(self.port).to_equal(self.parent.port)
+            expect(vars(self)).Not.to_include('app')
+
+        class AndItsChildren(TornadoHTTPContext):
+
+            def topic(self):
+                return self.fetch('/echo')
+
+            def should_use_the_same_isolated_handler(self, topic):
+                expect(topic.body).to_equal('mocked echo')
+
+    class WithAnotherMockedHandler(IsolatedTornadoHTTPContext):
+
+        def topic(self):
+            self.get_test_handler().echo = echoing('another mocked echo')
+            return self.fetch_many(['/echo', '/echo'])
+
+        def should_use_its_own_isolated_handler(self, topic):
+            expect([response.body for response in topic]).to_equal(
+                ['another mocked echo', 'another mocked echo'])
+
+    class ThatHasNoSideEffects(IsolatedTornadoHTTPContext):
+
+        def topic(self):
+            return self.fetch('/echo')
+
+        def should_use_the_original_handler(self, topic):
+            expect(topic.body).to_equal('echo')
+
+    class WithoutARoutingKey(TornadoHTTPContext):
+
+        def topic(self):
+            return self.fetch('/echo')
+
+        def should_use_the_default_handler(self, topic):
+            expect(topic.body).to_equal('echo')
+
+    class WithANestedSpec(TornadoHTTPContext):
+
+        def get_handler_spec(self):
+            return (r'^/other$', EchoHandler)
+
+        def topic(self):
+            return self.fetch('/other')
+
+        def should_serve_its_own_pattern(self, topic):
+            expect(topic.body).to_equal('echo')
+
+        class AndAnIsolatedHandler(IsolatedTornadoHTTPContext):
+
+            def topic(self):
+                self.get_test_handler().echo = echoing('nested echo')
+                return self.fetch('/other')
+
+            def should_use_its_own_isolated_handler(self, topic):
+                expect(topic.code).to_equal(200)
+                expect(topic.body).to_equal('nested echo')
+
+            def should_not_share_the_pooled_server(self, topic):
+                expect(vars(self)).to_include('app')
+
+    class WithOtherSettings(IsolatedTornadoHTTPContext):
+
+        def get_application_settings(self):
+            return {'gzip': False}
+
+        def topic(self):
+            return self.fetch('/echo')
+
+        def should_get_an_application_of_its_own(self, topic):
+            expect(topic.body).to_equal('echo')
+            expect(vars(self)).to_include('app')
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import tornado.web
+
+from pyvows import Vows, expect
+from tornado_pyvows import TornadoHTTPContext
+from tornado_pyvows.ports import bind_unused_port
+
+from vows.test_app import MainPageHandler
+
+
+class App(TornadoHTTPContext):
+
+    def get_app(self):
+        return tornado.web.Application([
+            (r"/", MainPageHandler),
+        ])
+
+
+@Vows.batch
+class KernelAssignedPorts(App):
+
+    def topic(self):
+        return self.get('/')
+
+    def should_serve_on_the_port_it_reports(self, topic):
+        expect(topic.body).to_equal('Hello, world')
+        sockets = self.http_server._sockets.values()
+        expect([sock.getsockname()[1] for sock in sockets]).to_equal(
+            [self.port])
+
+    class ForManyServersAtOnce(TornadoHTTPContext):
+
+        def topic(self):
+            contexts = [App(self) for _ in range(20)]
+            for context in contexts:
+                context.setup()
+            ports = [context.port for context in contexts]
+            for context in contexts:
+                context.teardown()
+            return ports
+
+        def should_never_hand_out_a_port_twice(self, topic):
+            expect(len(set(topic))).to_equal(20)
+
+    class BindingASocket(TornadoHTTPContext):
+
+        def topic(self):
+            sock, port = bind_unused_port('127.0.0.1')
+            try:
+                return sock.getsockname(), port
+            finally:
+                sock.close()
+
+        def should_return_the_bound_port(self, topic):
+            address, port = topic
+            expect(address).to_equal(('127.0.0.1', port))
+            expect(port).to_be_greater_than(0)
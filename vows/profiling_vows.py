@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import pstats
+
+import tornado.web
+
+from pyvows import Vows, expect
+from tornado_pyvows import TornadoHTTPContext
+
+from vows.test_app import BusyHandler, MainPageHandler
+
+
+@Vows.batch
+class ProfiledRequest(TornadoHTTPContext):
+    reuse_http_server = True
+
+    def get_app(self):
+        return tornado.web.Application([
+            (r"/", MainPageHandler),
+            (r"/busy", BusyHandler),
+        ])
+
+    def topic(self):
+        return self.get('/busy', profile=True)
+
+    def should_answer_as_usual(self, topic):
+        expect(topic.body).to_equal('done')
+
+    def should_sample_the_handler(self, topic):
+        expect(topic.profile.total).to_be_greater_than(0)
+        expect(topic.profile.collapsed()).to_include('get (test_app.py:')
+
+    def should_start_the_stacks_below_the_ioloop(self, topic):
+        for stack in topic.profile.samples:
+            expect(stack[0][2]).Not.to_equal('start')
+
+    def should_rank_the_functions(self, topic):
+        labels = [label for label, _, _ in topic.profile.top(sort='total')]
+        expect(labels).to_include(
+            'get (test_app.py:%d)' % BusyHandler.get.im_func.func_code
+            .co_firstlineno)
+
+    class WithCProfile(TornadoHTTPContext):
+
+        def topic(self):
+            return self.get('/busy?duration=0.01', profile='cprofile')
+
+        def should_attach_the_stats(self, topic):
+            expect(topic.profile).to_be_instance_of(pstats.Stats)
+            topic.profile.print_stats('BusyHandler|test_app')
+            expect(topic.profile.stream.getvalue()).to_include('(get)')
+
+    class WithoutProfiling(TornadoHTTPContext):
+
+        def topic(self):
+            return self.get('/')
+
+        def should_not_attach_a_profile(self, topic):
+            expect(hasattr(topic, 'profile')).to_be_false()
+
+    class ProfilingEveryRequest(TornadoHTTPContext):
+        profile_requests = True
+
+        def topic(self):
+            return self.get('/busy?duration=0.02')
+
+        def should_attach_a_profile(self, topic):
+            expect(topic.profile.total).to_be_greater_than(0)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import json
+import re
+
+import tornado.web
+from tornado.httpclient import HTTPResponse
+
+from pyvows import Vows, expect
+from tornado_pyvows import TornadoHTTPContext
+
+from vows.test_app import MainPageHandler
+
+
+class JSONHandler(tornado.web.RequestHandler):
+    def get(self):
+        self.set_header('Content-Type', 'application/json; charset=latin-1')
+        self.write(json.dumps({
+            'name': u'caf\xe9',
+            'items': [{'id': 1}, {'id': 2}],
+        }, ensure_ascii=False).encode('latin-1'))
+
+
+@Vows.batch
+class EnrichedResponse(TornadoHTTPContext):
+    reuse_http_server = True
+
+    def get_app(self):
+        return tornado.web.Application([
+            (r"/", MainPageHandler),
+            (r"/json", JSONHandler),
+        ])
+
+    def topic(self):
+        return self.get('/json')
+
+    def should_still_be_an_http_response(self, topic):
+        expect(topic).to_be_instance_of(HTTPResponse)
+        expect(topic.code).to_equal(200)
+
+    def should_decode_the_body_with_its_charset(self, topic):
+        expect(topic.charset).to_equal('latin-1')
+        expect(u'caf\xe9' in topic.text).to_be_true()
+
+    def should_parse_the_json_once(self, topic):
+        expect(topic.json is topic.json).to_be_true()
+        expect(topic.json['name']).to_equal(u'caf\xe9')
+
+    def should_expose_the_media_type(self, topic):
+        expect(topic.content_type).to_equal('application/json')
+
+    def should_follow_json_paths(self, topic):
+        expect(topic.json_path('items[1].id')).to_equal(2)
+        expect(topic.json_path('$.items.0.id')).to_equal(1)
+        expect(topic.json_path('items[5].id', None)).to_be_null()
+
+    def should_have_the_status(self, topic):
+        expect(topic).to_have_status(200)
+        expect(topic).Not.to_have_status(404)
+
+    def should_have_the_headers(self, topic):
+        expect(topic).to_have_header('Content-Type')
+        expect(topic).to_have_header('Content-Type',
+                                     re.compile('^application/json'))
+        expect(topic).Not.to_have_header('X-Missing')
+        expect(topic).Not.to_have_header('Content-Type', 'text/html')
+
+    def should_have_the_json_paths(self, topic):
+        expect(topic).to_have_json_path('items[0].id', 1)
+        expect(topic).to_have_json_path('name')
+        expect(topic).Not.to_have_json_path('items[0].name')
+        expect(topic).Not.to_have_json_path('items[0].id', 2)
+
+    class AFailingAssertion(TornadoHTTPContext):
+
+        @Vows.capture_error
+        def topic(self, response):
+            expect(response).to_have_json_path('items[1].id', 3)
+
+        def should_tell_what_was_found(self, topic):
+            expect(topic).to_be_an_error_like(AssertionError)
+            expect(str(topic)).to_include('items[1].id')
+            expect(str(topic)).to_include('2')
+
+    class ManyResponses(TornadoHTTPContext):
+
+        def topic(self):
+            return self.fetch_many(['/', '/json'])
+
+        def should_be_enriched_too(self, topic):
+            expect(topic[0].text).to_equal(u'Hello, world')
+            expect(topic[1]).to_have_json_path('items[0].id', 1)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import tornado.web
+
+from pyvows import Vows, expect
+from tornado_pyvows import TornadoHTTPContext
+
+from vows.test_app import MainPageHandler
+
+
+@Vows.batch
+class ReusedServer(TornadoHTTPContext):
+    reuse_http_server = True
+
+    def get_app(self):
+        return tornado.web.Application([
+            (r"/", MainPageHandler),
+        ])
+
+    class FirstChild(TornadoHTTPContext):
+
+        def topic(self):
+            return (self.parent.http_server, self.http_server, self.get('/'))
+
+        def should_use_the_parent_server(self, topic):
+            parent_server, server, _ = topic
+            expect(server).to_equal(parent_server)
+
+        def should_not_have_its_own_server(self, topic):
+            expect(vars(self)).Not.to_include('http_server')
+
+        def should_be_hello_world(self, topic):
+            _, _, response = topic
+            expect(response.body).to_equal('Hello, world')
+
+        class GrandChild(TornadoHTTPContext):
+
+            def topic(self):
+                return (self.parent.parent.port, self.port, self.get('/'))
+
+            def should_use_the_outermost_port(self, topic):
+                outer_port, port, _ = topic
+                expect(port).to_equal(outer_port)
+
+            def should_be_hello_world(self, topic):
+                _, _, response = topic
+                expect(response.body).to_equal('Hello, world')
+
+
+@Vows.batch
+class NotReusedServer(TornadoHTTPContext):
+
+    def get_app(self):
+        return tornado.web.Application([
+            (r"/", MainPageHandler),
+        ])
+
+    class Child(TornadoHTTPContext):
+
+        def topic(self):
+            return (self.parent.port, self.port)
+
+        def should_start_its_own_server(self, topic):
+            parent_port, port = topic
+            expect(port).Not.to_equal(parent_port)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import json
+import os
+import shutil
+import tempfile
+
+import tornado.web
+
+from pyvows import Vows, expect
+from tornado_pyvows import TornadoHTTPContext
+from tornado_pyvows.standin import Cassette, StandIn
+
+from vows.test_app import MainPageHandler
+
+
+def interaction(method, uri, body, code=200, latency=0):
+    return {
+        'request': {'method': method, 'uri': uri},
+        'response': {'code': code, 'body': body, 'latency': latency,
+                     'headers': [['X-Recorded', 'yes']]}
+    }
+
+
+@Vows.batch
+class StandInReplay(TornadoHTTPContext):
+    stand_in_latency = 0.1
+
+    def get_cassette(self):
+        return Cassette([
+            interaction('GET', '/counter', 'first'),
+            interaction('GET', '/counter', 'second'),
+            interaction('POST', '/counter', 'created', code=201),
+        ])
+
+    def topic(self):
+        return [self.get(self.stand_in.get_url('/counter')) for _ in range(3)]
+
+    def should_replay_the_recordings_in_order(self, topic):
+        expect([response.body for response in topic]).to_equal(
+            ['first', 'second', 'second'])
+
+    def should_replay_the_headers(self, topic):
+        expect(topic[0].headers['X-Recorded']).to_equal('yes')
+
+    def should_wait_the_configured_latency(self, topic):
+        for response in topic:
+            expect(response.request_time).to_be_greater_than(0.09)
+
+    class MatchingTheMethod(TornadoHTTPContext):
+
+        def topic(self):
+            return self.post(self.stand_in.get_url('/counter'))
+
+        def should_replay_the_post(self, topic):
+            expect(topic.code).to_equal(201)
+            expect(topic.body).to_equal('created')
+
+    class WithoutARecording(TornadoHTTPContext):
+
+        def topic(self):
+            return self.get(self.stand_in.get_url('/missing'))
+
+        def should_be_not_found(self, topic):
+            expect(topic.code).to_equal(404)
+
+
+@Vows.batch
+class StandInRecording(TornadoHTTPContext):
+
+    def get_app(self):
+        return tornado.web.Application([
+            (r"/", MainPageHandler),
+        ])
+
+    def topic(self):
+        directory = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(directory, 'cassette.json')
+            stand_in = StandIn(filename, self.io_loop,
+                               target=self.get_url('/')).start()
+            recorded = self.get(stand_in.get_url('/'))
+            stand_in.stop()
+
+            with open(filename) as cassette_file:
+                data = json.load(cassette_file)
+
+            stand_in = StandIn(filename, self.io_loop).start()
+            replayed = self.get(stand_in.get_url('/'))
+            stand_in.stop()
+            return recorded, replayed, data
+        finally:
+            shutil.rmtree(directory)
+
+    def should_answer_with_the_real_response(self, topic):
+        recorded, _, _ = topic
+        expect(recorded.body).to_equal('Hello, world')
+
+    def should_save_the_interaction(self, topic):
+        _, _, data = topic
+        interaction = data['interactions'][0]
+        expect(interaction['request']).to_equal(
+            {'method': 'GET', 'uri': '/'})
+        expect(interaction['response']['body']).to_equal('Hello, world')
+        expect(interaction['response']).to_include('latency')
+
+    def should_replay_it_afterwards(self, topic):
+        _, replayed, _ = topic
+        expect(replayed.code).to_equal(200)
+        expect(replayed.body).to_equal('Hello, world')
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import hashlib
+
+import tornado.web
+
+from pyvows import Vows, expect
+from tornado_pyvows import TornadoHTTPContext
+from tornado_pyvows.response import Response
+from tornado_pyvows.streaming import StreamDigest
+
+from vows.test_app import StreamingHandler
+
+
+def expected_body(chunks, size):
+    return ''.join(str(index % 10) * size for index in range(chunks)) + 'END'
+
+
+class StreamingContext(TornadoHTTPContext):
+    def get_app(self):
+        return tornado.web.Application([
+            (r"/stream", StreamingHandler),
+        ])
+
+    class WhenIterating(TornadoHTTPContext):
+
+        def topic(self):
+            stream = self.stream('/stream?chunks=5&size=100')
+            return (list(stream), stream.response)
+
+        def should_yield_more_than_one_chunk(self, topic):
+            chunks, _ = topic
+            expect(len(chunks)).to_be_greater_than(1)
+
+        def should_yield_the_whole_body(self, topic):
+            chunks, _ = topic
+            expect(''.join(chunks)).to_equal(expected_body(5, 100))
+
+        def should_not_buffer_the_body(self, topic):
+            _, response = topic
+            expect(response.body).to_be_empty()
+
+        def should_keep_the_response_code(self, topic):
+            _, response = topic
+            expect(response.code).to_equal(200)
+
+        def should_keep_a_response_with_its_views(self, topic):
+            _, response = topic
+            expect(response).to_be_instance_of(Response)
+            expect(response.content_type).to_equal('text/html')
+
+    class WhenDigesting(TornadoHTTPContext):
+
+        def topic(self):
+            return self.stream('/stream?chunks=50&size=4096').digest(
+                'sha1', contains=['0123', 'END', 'missing'])
+
+        def should_count_the_bytes(self, topic):
+            expect(topic.size).to_equal(len(expected_body(50, 4096)))
+
+        def should_checksum_the_body(self, topic):
+            expect(topic.hexdigest).to_equal(
+                hashlib.sha1(expected_body(50, 4096)).hexdigest())
+
+        def should_find_the_strings_in_the_body(self, topic):
+            expect(topic.contains('0123')).to_be_false()
+            expect(topic.contains('END')).to_be_true()
+
+        def should_not_find_what_is_not_there(self, topic):
+            expect(topic.contains('missing')).to_be_false()
+
+        def should_keep_the_response(self, topic):
+            expect(topic.response.code).to_equal(200)
+
+
+@Vows.batch
+class Streaming(StreamingContext):
+    pass
+
+
+@Vows.batch
+class InProcessStreaming(StreamingContext):
+    in_process_transport = True
+
+
+@Vows.batch
+class CurlStreaming(StreamingContext):
+    keep_alive_http_client = True
+
+
+@Vows.batch
+class AStreamDigest(Vows.Context):
+
+    def topic(self):
+        digest = StreamDigest('sha1', contains=['bc', 'abcd', 'cda', 'x'])
+        digest.update('ab')
+        digest.update('cd')
+        return digest
+
+    def should_find_a_string_across_two_chunks(self, topic):
+        expect(topic.contains('bc')).to_be_true()
+
+    def should_find_a_string_spanning_both_chunks(self, topic):
+        expect(topic.contains('abcd')).to_be_true()
+
+    def should_not_find_what_is_not_there(self, topic):
+        expect(topic.contains('cda')).to_be_false()
+        expect(topic.contains('x')).to_be_false()
+
+    def should_digest_the_whole_body(self, topic):
+        expect(topic.size).to_equal(4)
+        expect(topic.hexdigest).to_equal(hashlib.sha1('abcd').hexdigest())
+
+    class FedChunksShorterThanTheString(Vows.Context):
+
+        def topic(self):
+            digest = StreamDigest(contains=['abcdef'])
+            for chunk in ('ab', 'cd', 'ef'):
+                digest.update(chunk)
+            return digest
+
+        def should_find_it_across_all_of_them(self, topic):
+            expect(topic.contains('abcdef')).to_be_true()
@@ -9,9 +9,12 @@
 # Copyright (c) 2011 globo.com rafael@caricio.com
 
 import json
+import time
 
+import tornado.ioloop
 import tornado.web
-from tornado.web import RequestHandler
+from tornado.web import RequestHandler, asynchronous
+from tornado.websocket import WebSocketHandler
 
 class MainPageHandler(RequestHandler):
     def head(self):
@@ -30,3 +33,47 @@ class MainPageHandler(RequestHandler):
             result[field_name] = file_dict 
 
         self.write(json.dumps(result))
+
+
+class DelayedHandler(RequestHandler):
+    @asynchronous
+    def get(self):
+        delay = float(self.get_argument('delay', 0.2))
+        tornado.ioloop.IOLoop.instance().add_timeout(
+            time.time() + delay,
+            lambda: self.finish(self.get_argument('id', ''))
+        )
+
+
+class StreamingHandler(RequestHandler):
+    """Writes ``chunks`` pieces of ``size`` bytes, flushing each one."""
+
+    def get(self):
+        chunks = int(self.get_argument('chunks', 10))
+        size = int(self.get_argument('size', 1024))
+        for index in range(chunks):
+            self.write(str(index % 10) * size)
+            self.flush()
+        self.finish('END')
+
+
+class EchoWebSocketHandler(WebSocketHandler):
+    """Echoes every message; ``push <n>`` is answered with n messages."""
+
+    def on_message(self, message):
+        if message.startswith('push '):
+            for index in range(int(message.split(' ', 1)[1])):
+                self.write_message('pushed %d' % index)
+        else:
+            self.write_message(message, binary=not isinstance(message,
+                                                              unicode))
+
+
+class BusyHandler(RequestHandler):
+    """Keeps the CPU busy for ``duration`` seconds before answering."""
+
+    def get(self):
+        deadline = time.time() + float(self.get_argument('duration', 0.05))
+        while time.time() < deadline:
+            sum(range(100))
+        self.write('done')
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import json
+import os
+import stat
+
+import tornado.web
+
+from pyvows import Vows, expect
+from tornado_pyvows import TornadoHTTPContext
+from tornado_pyvows.unixsocket import UnixSocketHTTPClient
+
+from vows.test_app import MainPageHandler, StreamingHandler
+
+
+@Vows.batch
+class UnixSocket(TornadoHTTPContext):
+    unix_socket = True
+
+    def get_app(self):
+        return tornado.web.Application([
+            (r"/", MainPageHandler),
+            (r"/stream", StreamingHandler),
+        ])
+
+    def topic(self):
+        return self.get('/')
+
+    def should_answer_through_the_socket(self, topic):
+        expect(topic.code).to_equal(200)
+        expect(topic.body).to_equal('Hello, world')
+
+    def should_listen_on_a_unix_socket(self, topic):
+        expect(stat.S_ISSOCK(os.stat(self.socket_path).st_mode)).to_be_true()
+
+    def should_keep_the_usual_urls(self, topic):
+        expect(self.get_url('/path')).to_equal('http://localhost/path')
+
+    class Posting(TornadoHTTPContext):
+
+        def topic(self):
+            return self.post('/', data={'name': 'value'})
+
+        def should_send_the_body(self, topic):
+            expect(json.loads(topic.body)).to_equal({'name': 'value'})
+
+        def should_go_through_a_unix_socket_too(self, topic):
+            expect(self.get_url('/')).to_equal('http://localhost/')
+            expect(self.http_client).to_be_instance_of(UnixSocketHTTPClient)
+            expect(stat.S_ISSOCK(os.stat(
+                self.http_client.socket_path).st_mode)).to_be_true()
+
+    class SendingManyRequests(TornadoHTTPContext):
+
+        def topic(self):
+            return self.fetch_many(['/'] * 20)
+
+        def should_answer_them_all(self, topic):
+            expect([response.body for response in topic]).to_equal(
+                ['Hello, world'] * 20)
+
+        def should_not_listen_on_a_port(self, topic):
+            expect(self.port).to_be_null()
+
+    class Streaming(TornadoHTTPContext):
+
+        def topic(self):
+            return self.stream('/stream?chunks=5&size=100').digest(
+                contains=['END'])
+
+        def should_receive_the_whole_body(self, topic):
+            expect(topic.size).to_equal(503)
+            expect(topic.contains('END')).to_be_true()
+
+    class FetchingOtherURLs(TornadoHTTPContext):
+
+        def get_app(self):
+            return tornado.web.Application([
+                (r"/", MainPageHandler),
+            ])
+
+        def topic(self):
+            # the client of the parent, with a TCP URL of this context
+            self.parent.http_client.fetch(self.get_url('/'), self.stop)
+            return self.wait(), self.port
+
+        def should_go_over_tcp(self, topic):
+            response, port = topic
+            expect(port).to_be_greater_than(0)
+            expect(response.body).to_equal('Hello, world')
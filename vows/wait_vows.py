@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import time
+
+import tornado.web
+from tornado.ioloop import IOLoop
+
+from pyvows import Vows, expect
+from tornado_pyvows import TornadoContext, TornadoHTTPContext
+from tornado_pyvows.context import _cancel_timeout
+
+from vows.test_app import MainPageHandler
+
+
+class CountingIOLoop(IOLoop):
+
+    def __init__(self, *args, **kwargs):
+        IOLoop.__init__(self, *args, **kwargs)
+        self.starts = 0
+
+    def start(self):
+        self.starts += 1
+        IOLoop.start(self)
+
+
+class OnItsOwnIOLoop(TornadoContext):
+    """Closes the IOLoop the topic sets up."""
+
+    def teardown(self):
+        if 'io_loop' in vars(self):
+            self.io_loop.close(all_fds=True)
+        TornadoContext.teardown(self)
+
+
+def live_timeouts(io_loop):
+    return len([t for t in io_loop._timeouts if t.callback is not None])
+
+
+@Vows.batch
+class Wait(TornadoContext):
+
+    class WithACondition(OnItsOwnIOLoop):
+
+        def topic(self):
+            self.io_loop = CountingIOLoop()
+            calls = []
+
+            def call():
+                calls.append(None)
+                self.stop(len(calls))
+
+            for _ in range(3):
+                self.io_loop.add_callback(call)
+            result = self.wait(condition=lambda: len(calls) == 3)
+            return result, self.io_loop.starts
+
+        def should_return_the_last_stop_argument(self, topic):
+            expect(topic[0]).to_equal(3)
+
+        def should_start_the_ioloop_once(self, topic):
+            expect(topic[1]).to_equal(1)
+
+    class WhenTimingOut(OnItsOwnIOLoop):
+
+        def topic(self):
+            self.io_loop = IOLoop()
+            try:
+                self.wait(timeout=0.01)
+            except AssertionError as error:
+                return error, live_timeouts(self.io_loop)
+
+        def should_fail(self, topic):
+            expect(str(topic[0])).to_include('timed out')
+
+        def should_not_leave_timeouts_behind(self, topic):
+            expect(topic[1]).to_equal(0)
+
+    class CancellingTimeouts(OnItsOwnIOLoop):
+
+        def topic(self):
+            io_loop = self.io_loop = IOLoop()
+            for _ in range(5000):
+                _cancel_timeout(
+                    io_loop, io_loop.add_timeout(time.time() + 5, None)
+                )
+            return io_loop
+
+        def should_keep_the_heap_small(self, topic):
+            expect(len(topic._timeouts)).to_be_lesser_than(512)
+
+
+@Vows.batch
+class WaitOnFetch(TornadoHTTPContext):
+
+    def get_new_ioloop(self):
+        return IOLoop()
+
+    def get_app(self):
+        return tornado.web.Application([
+            (r"/", MainPageHandler),
+        ])
+
+    def topic(self):
+        responses = [self.get('/') for _ in range(20)]
+        return responses, live_timeouts(self.io_loop)
+
+    def teardown(self):
+        TornadoHTTPContext.teardown(self)
+        self.io_loop.close(all_fds=True)
+
+    def should_answer_every_request(self, topic):
+        expect([response.code for response in topic[0]]).to_equal([200] * 20)
+
+    def should_cancel_the_timeout_of_every_wait(self, topic):
+        expect(topic[1]).to_equal(0)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# tornado-pyvows extensions
+# https://github.com/rafaelcaricio/tornado-pyvows
+
+# Licensed under the MIT license:
+# http://www.opensource.org/licenses/mit-license
+# Copyright (c) 2011 Rafael Caricio rafael@caricio.com
+
+import tornado.web
+
+from pyvows import Vows, expect
+from tornado_pyvows import (
+    IsolatedTornadoHTTPContext,
+    TornadoWebSocketContext
+)
+
+from vows.test_app import EchoWebSocketHandler, MainPageHandler
+
+
+@Vows.batch
+class WebSocketEcho(TornadoWebSocketContext):
+    reuse_http_server = True
+
+    def get_app(self):
+        return tornado.web.Application([
+            (r"/", MainPageHandler),
+            (r"/echo", EchoWebSocketHandler),
+        ])
+
+    def topic(self):
+        messages = [u'message %d' % index for index in range(100)]
+        return self.exchange('/echo', messages)
+
+    def should_get_a_reply_per_message(self, topic):
+        expect(topic.received).to_equal(100)
+
+    def should_get_the_replies_in_order(self, topic):
+        expect(topic.replies).to_equal(
+            [u'message %d' % index for index in range(100)])
+
+    def should_measure_the_message_rate(self, topic):
+        expect(topic.messages_per_second).to_be_greater_than(0)
+
+    def should_measure_the_latencies(self, topic):
+        expect(topic.latencies).to_length(100)
+        expect(topic.p95_ms).to_be_greater_than(0)
+
+    class OnTheSameConnection(TornadoWebSocketContext):
+
+        def topic(self):
+            connection = self.websocket_connect('/echo')
+            first = self.exchange(connection, [u'first'])
+            large = u'x' * 70000
+            second = self.exchange(connection, [large, u'é'])
+            binary = self.exchange(connection, ['\x00\xff'], binary=True)
+            return first, second, binary, large
+
+        def should_keep_the_connection_open(self, topic):
+            first, second, _, large = topic
+            expect(first.replies).to_equal([u'first'])
+            expect(second.replies).to_equal([large, u'é'])
+
+        def should_echo_binary_messages(self, topic):
+            _, _, binary, _ = topic
+            expect(binary.replies).to_equal(['\x00\xff'])
+
+    class Pushing(TornadoWebSocketContext):
+
+        def topic(self):
+            connection = self.websocket_connect('/echo')
+            connection.write_message('push 50')
+            return self.exchange(connection, [], replies=50)
+
+        def should_collect_the_pushed_messages(self, topic):
+            expect(topic.replies).to_equal(
+                [u'pushed %d' % index for index in range(50)])
+
+    class ToAPlainHandler(TornadoWebSocketContext):
+
+        @Vows.capture_error
+        def topic(self):
+            return self.websocket_connect('/')
+
+        def should_fail_the_handshake(self, topic):
+            expect(topic).to_be_an_error_like(IOError)
+
+
+@Vows.batch
+class WebSocketOverAUnixSocket(TornadoWebSocketContext):
+    unix_socket = True
+
+    def get_app(self):
+        return tornado.web.Application([
+            (r"/echo", EchoWebSocketHandler),
+        ])
+
+    def topic(self):
+        return self.exchange('/echo', [u'through the socket'])
+
+    def should_reach_the_handler(self, topic):
+        expect(topic.replies).to_equal([u'through the socket'])
+
+    class InAChildContext(TornadoWebSocketContext):
+
+        def topic(self):
+            return self.exchange('/echo', [u'from a child'])
+
+        def should_reach_the_handler_too(self, topic):
+            expect(topic.replies).to_equal([u'from a child'])
+
+
+def shouting(self, message):
+    self.write_message(message.upper())
+
+
+@Vows.batch
+class PooledWebSocketHandlers(TornadoWebSocketContext):
+    pool_isolated_handlers = True
+
+    def get_handler_spec(self):
+        return (r'^/echo$', EchoWebSocketHandler)
+
+    class WithAMockedHandler(IsolatedTornadoHTTPContext,
+                             TornadoWebSocketContext):
+
+        def topic(self):
+            self.get_test_handler().on_message = shouting
+            return self.exchange('/echo', [u'isolated'])
+
+        def should_use_the_isolated_handler(self, topic):
+            expect(topic.replies).to_equal([u'ISOLATED'])
+
+    class WithTheOriginalHandler(IsolatedTornadoHTTPContext,
+                                 TornadoWebSocketContext):
+
+        def topic(self):
+            return self.exchange('/echo', [u'isolated'])
+
+        def should_use_its_own_handler(self, topic):
+            expect(topic.replies).to_equal([u'isolated'])